@@ -0,0 +1,6 @@
+"""
+Benchmarks ohne Netz: server.py ist ein lokaler Stand-in fuer die
+Sitemaps der Medien, crawl.py misst damit ganze Crawls, classify.py
+den Klassifizierer ueber die URL-CSVs im Repo und prefilter.py den
+Vorfilter gegen normales Parsen.
+"""
@@ -0,0 +1,227 @@
+import argparse
+import csv
+import gc
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from urllib.parse import unquote
+
+from classify_rules import (
+    CATEGORIES, OUTLET_RULES, TOKEN_RE, classifier_for, classify_many, classify_url, matches_rules, tokenize,
+)
+from reclassify import find_url_csvs, outlet_of
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classify_baseline.json")
+ROUNDS = 5
+
+
+def legacy_tokenize(url: str, fold=None) -> set[str]:
+    # Stand der Crawler-Skripte vor dem crawler-Paket (aftonbladet, jyllands-posten
+    # mit unquote + replace-Kette, alle anderen nur lower + re.sub), als Referenz
+    lower = url.lower()
+    if fold:
+        lower = unquote(url).lower()
+        for char, repl in fold:
+            lower = lower.replace(char, repl)
+    cleaned = re.sub(r"[^a-z0-9]+", " ", lower)
+    return set(t for t in cleaned.split() if t)
+
+
+def regex_tokenize(url: str, fold=None) -> set[str]:
+    # gemeinsame Version in classify_rules vor dem Normalizer: ein neuer String
+    # pro fold-Paar, dann TOKEN_RE.findall
+    lower = url.lower()
+    if fold:
+        lower = unquote(url).lower()
+        for char, repl in fold:
+            lower = lower.replace(char, repl)
+    return set(TOKEN_RE.findall(lower))
+
+
+def load_corpus(outlets=None) -> dict:
+    """{Medium: (urls, categories)} aus den */data/*_fussball_urls_*.csv."""
+    corpus = {}
+    for path in find_url_csvs(outlets=outlets):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = [(row["url"], row["category"]) for row in csv.DictReader(f)]
+        urls, categories = corpus.setdefault(outlet_of(path), ([], []))
+        urls.extend(url for url, _ in rows)
+        categories.extend(category for _, category in rows)
+    return corpus
+
+
+def implementations(outlet: str) -> dict:
+    """Name -> f(url) fuer ein Medium; der Name ist auch der Key im Baseline-File."""
+    fold = OUTLET_RULES.get(outlet, {}).get("fold")
+    return {
+        "legacy_tokenize": lambda url: legacy_tokenize(url, fold),
+        "regex_tokenize": lambda url: regex_tokenize(url, fold),
+        "tokenize": lambda url: tokenize(url, fold),
+        "matches_rules": lambda url: matches_rules(url, outlet),
+        "classify_url": lambda url: classify_url(url, outlet),
+        "match_and_classify": classifier_for(outlet).match_and_classify,
+    }
+
+
+def batch_implementations(outlet: str) -> dict:
+    """Name -> f(urls) fuer Funktionen, die eine ganze Spalte auf einmal nehmen."""
+    return {
+        "classify_many": lambda urls: classify_many(urls, outlet),
+    }
+
+
+def _render(value) -> str:
+    if isinstance(value, (set, frozenset)):
+        return " ".join(sorted(value))
+    return str(value)
+
+
+def digest(func, urls: list) -> str:
+    h = hashlib.sha256()
+    for url in urls:
+        h.update(_render(func(url)).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def measure(func, urls: list, rounds: int = ROUNDS, batch: bool = False) -> dict:
+    """
+    ns/URL: bester von rounds Durchlaeufen. Bloecke/URL und Peak kommen aus
+    einem eigenen Durchlauf unter tracemalloc, der die Ergebnisse behaelt
+    (wie reclassify/der Crawler): gehaltene Speicherbloecke pro URL und
+    groesster belegter Speicher inkl. kurzlebiger Zwischenobjekte. Mit
+    batch bekommt func die ganze Liste statt einer URL.
+    """
+    func(urls[:1] if batch else urls[0])  # Caches (classifier_for, phrase_matcher) nicht mitmessen
+    best = None
+    for _ in range(max(1, rounds)):
+        gc.collect()
+        start = time.perf_counter_ns()
+        if batch:
+            func(urls)
+        else:
+            for url in urls:
+                func(url)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        blocks = sys.getallocatedblocks()
+        results = func(urls) if batch else [func(url) for url in urls]
+        blocks = sys.getallocatedblocks() - blocks
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    del results
+    return {
+        "urls": len(urls),
+        "ns_per_url": best / len(urls),
+        "blocks_per_url": blocks / len(urls),
+        "peak_kib": peak / 1024,
+    }
+
+
+def load_baseline(path: str = BASELINE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check(corpus: dict, baseline: dict) -> list:
+    """
+    Waechter fuer Umbauten am Klassifizierer: classify_url muss die Spalte
+    category der CSVs treffen, classify_many Zeile fuer Zeile classify_url,
+    alle Funktionen ihren Digest im Baseline-File. Gibt die Abweichungen
+    als Text zurueck (leer = alles gleich).
+    """
+    problems = []
+    for outlet, (urls, categories) in corpus.items():
+        single = [classify_url(url, outlet) for url in urls]
+        wrong = sum(1 for category, expected in zip(single, categories) if category != expected)
+        if wrong:
+            problems.append(f"{outlet}: classify_url weicht bei {wrong} von {len(urls)} URLs von der CSV ab")
+        many = classify_many(urls, outlet)
+        wrong = sum(1 for code, category in zip(many, single) if CATEGORIES[code] != category)
+        if wrong or len(many) != len(urls):
+            problems.append(f"{outlet}: classify_many weicht bei {wrong} von {len(urls)} URLs von classify_url ab")
+        expected = baseline.get(outlet, {})
+        for name, func in implementations(outlet).items():
+            if name not in expected:
+                problems.append(f"{outlet}: {name} fehlt im Baseline-File (--update)")
+            elif digest(func, urls) != expected[name]:
+                problems.append(f"{outlet}: {name} liefert andere Ergebnisse als im Baseline-File")
+    return problems
+
+
+def write_baseline(corpus: dict, path: str = BASELINE):
+    baseline = load_baseline(path)
+    for outlet, (urls, _) in corpus.items():
+        baseline[outlet] = {name: digest(func, urls) for name, func in implementations(outlet).items()}
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def bench_classify(corpus: dict, rounds: int = ROUNDS, names=None) -> list:
+    results = []
+    for outlet, (urls, _) in corpus.items():
+        for name, func in implementations(outlet).items():
+            if names and name not in names:
+                continue
+            results.append(dict(measure(func, urls, rounds), outlet=outlet, name=name))
+        for name, func in batch_implementations(outlet).items():
+            if names and name not in names:
+                continue
+            results.append(dict(measure(func, urls, rounds, batch=True), outlet=outlet, name=name))
+    return results
+
+
+def print_results(results: list):
+    header = f"{'Medium':<16} {'Funktion':<19} {'URLs':>7} {'ns/URL':>8} {'Bloecke/URL':>11} {'Peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['outlet']:<16} {r['name']:<19} {r['urls']:>7} {r['ns_per_url']:>8.0f} "
+              f"{r['blocks_per_url']:>11.2f} {r['peak_kib']:>9.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.classify",
+        description="Misst tokenize, matches_rules, classify_url und classify_many ueber die URL-CSVs im Repo.",
+    )
+    parser.add_argument("outlets", nargs="*", metavar="MEDIUM", help="Ordnernamen (Standard: alle mit URL-CSV)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Zeitmessungen pro Funktion, die beste zaehlt")
+    parser.add_argument("--only", action="append", metavar="FUNKTION", help="nur diese Funktion messen")
+    parser.add_argument("--check", action="store_true", help="nur den Waechter laufen lassen, nicht messen")
+    parser.add_argument("--update", action="store_true", help="Baseline-File mit den aktuellen Ergebnissen neu schreiben")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(outlets=set(args.outlets))
+    if not corpus:
+        parser.error("keine URL-CSVs gefunden")
+
+    if args.update:
+        write_baseline(corpus)
+        print(f"Baseline geschrieben: {BASELINE}")
+    problems = check(corpus, load_baseline())
+    for problem in problems:
+        print(f"FEHLER {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"Waechter ok: {sum(len(urls) for urls, _ in corpus.values())} URLs, {len(corpus)} Medien")
+    if not args.check:
+        print_results(bench_classify(corpus, args.rounds, args.only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import contextlib
+import io
+import multiprocessing
+import resource
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import http_cache
+from crawler import run_outlet
+
+from .server import LAYOUTS, URLS_PER_SITEMAP, SitemapServer
+
+# ohne Rate-Limit misst der Benchmark den Crawler, nicht die Politeness
+REQUESTS_PER_SECOND = 1000.0
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM beginnt beim exec neu; ru_maxrss zaehlt den Elternprozess vor dem exec mit
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_rss_mb() -> float:
+    # groesster beendeter Kindprozess (Prozess-Pool der Parse-Stufe), Linux: KB
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def _crawl_one(outlet: str, overrides: dict, verbose: bool) -> dict:
+    # eigener Prozess pro Medium, damit Peak-RSS nur diesen Crawl misst
+    http_cache.configure(enabled=False)
+    out_dir = tempfile.mkdtemp(prefix=f"bench-{outlet}-")
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(None if verbose else out):
+            result = run_outlet(outlet, out_dir=out_dir, status=False, **overrides)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    if result is None:
+        return {"outlet": outlet, "error": out.getvalue().strip().splitlines()[-1:]}
+    seconds = result["seconds"]
+    return {
+        "outlet": outlet,
+        "sitemaps": result["stages"]["fetch"]["items"],
+        "urls": result["entries"],
+        "rows": result["rows"],
+        "seconds": seconds,
+        "sitemaps_per_second": result["stages"]["fetch"]["items"] / seconds if seconds else 0.0,
+        "urls_per_second": result["entries"] / seconds if seconds else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "worker_rss_mb": _worker_rss_mb(),
+        "stages": result["stages"],
+    }
+
+
+def bench_crawl(outlets=None, rounds: int = 1, polite: bool = False, verbose: bool = False,
+                server_options: dict = None, **overrides) -> list:
+    """
+    Crawlt jedes Medium rounds mal gegen den lokalen Stand-in (bench.server)
+    und gibt pro Lauf Sitemaps/s, URLs/s und Peak-RSS zurueck. overrides
+    gehen an run_outlet; ohne polite laeuft der Crawl mit
+    REQUESTS_PER_SECOND statt dem Rate-Limit aus outlets.py.
+    """
+    outlets = list(outlets or LAYOUTS)
+    if not polite:
+        overrides.setdefault("requests_per_second", REQUESTS_PER_SECOND)
+    results = []
+    with SitemapServer(outlets, **(server_options or {})) as server:
+        for outlet in outlets:
+            options = dict(server.overrides(outlet), **overrides)
+            for _ in range(rounds):
+                # frischer Prozess pro Lauf (spawn: kein geerbter Speicher, kein geerbter Limiter)
+                with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    results.append(pool.submit(_crawl_one, outlet, options, verbose).result())
+    return results
+
+
+def print_results(results: list):
+    header = f"{'Medium':<16} {'Sitemaps':>8} {'URLs':>9} {'Zeilen':>7} {'Zeit':>7} {'Sitemaps/s':>10} " \
+             f"{'URLs/s':>9} {'RSS MB':>7} {'Worker MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['outlet']:<16} FEHLER: {r['error']}")
+            continue
+        print(f"{r['outlet']:<16} {r['sitemaps']:>8} {r['urls']:>9} {r['rows']:>7} {r['seconds']:>6.2f}s "
+              f"{r['sitemaps_per_second']:>10.1f} {r['urls_per_second']:>9.0f} {r['peak_rss_mb']:>7.1f} "
+              f"{r['worker_rss_mb']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.crawl",
+        description="Ganze Crawls gegen einen lokalen Stand-in der Sitemaps (ohne Netz).",
+    )
+    parser.add_argument("outlets", nargs="*", metavar="MEDIUM", help=f"Standard: alle ({', '.join(LAYOUTS)})")
+    parser.add_argument("--rounds", type=int, default=1, help="Laeufe pro Medium")
+    parser.add_argument("--urls", type=int, default=URLS_PER_SITEMAP, help="URLs pro Urlset")
+    parser.add_argument("--first-year", type=int, default=2005, help="erstes Jahr mit Sitemaps im Stand-in")
+    parser.add_argument("--latency", type=float, default=0.0, help="Sekunden pro Antwort")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- Sekunden auf latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil Urlsets mit 503")
+    parser.add_argument("--polite", action="store_true", help="Rate-Limit der Config statt ohne Bremse")
+    parser.add_argument("--processes", type=int, help="wie beim Crawler (0: Threads)")
+    parser.add_argument("--verbose", action="store_true", help="Ausgaben der Crawler zeigen")
+    args = parser.parse_args(argv)
+    unknown = [o for o in args.outlets if o not in LAYOUTS]
+    if unknown:
+        parser.error(f"unbekanntes Medium: {', '.join(unknown)}")
+
+    overrides = {}
+    if args.processes is not None:
+        overrides["process_pool"] = args.processes > 0
+        overrides["parse_workers"] = args.processes or None
+    server_options = {
+        "years": (args.first_year, date.today().year),
+        "urls_per_sitemap": args.urls,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+    }
+    results = bench_crawl(args.outlets, args.rounds, args.polite, args.verbose, server_options, **overrides)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import html
+import io
+import random
+import sys
+import time
+from urllib.parse import quote
+
+from crawler.outlets import OUTLETS, outlet_config
+from crawler.runner import process_sitemap
+
+from .server import recorded_urls
+
+NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+IMAGE_NAMESPACE = "http://www.google.com/schemas/sitemap-image/1.1"
+SM_URL = "https://example.com/sitemap-2019-01.xml"
+# Urlsets pro Medium fuer den Vergleich und Groesse der Urlsets fuer die Zeitmessung
+SAMPLES = 40
+NOISE_URLS = 20000
+HITS = (0, 3, 50, 2000)
+
+
+def _corpus() -> list:
+    urls = []
+    for outlet in OUTLETS:
+        for rows in recorded_urls(outlet).values():
+            urls.extend(url for url, _lastmod in rows)
+    return urls
+
+
+def _mutate(rng: random.Random, url: str) -> str:
+    r = rng.random()
+    if r < 0.1:
+        return url.upper()
+    if r < 0.2:
+        return quote(url, safe=":/")
+    if r < 0.3:
+        i = rng.randrange(len(url))
+        return url[:i] + rng.choice(["ü", "å", "æ", "ø", "%C3%A5", "&", "İ", "K", "é"]) + url[i:]
+    if r < 0.4:
+        return url.replace("-", rng.choice(["_", "%2D", "+", "."]))
+    if r < 0.5:
+        words = ["news", "politik", "a", "fussball", "frauen", "damer", "kvinde", "calcio", "foot"]
+        return "https://www.example.com/" + "-".join(rng.choice(words) for _ in range(4))
+    return url
+
+
+def _item(rng: random.Random, url: str, i: int, p: str) -> str:
+    loc = html.escape(url, quote=False)
+    lastmod = f"<{p}lastmod>20{rng.randint(5, 25):02d}-{rng.randint(1, 12):02d}-01</{p}lastmod>" \
+        if rng.random() < 0.8 else ""
+    style = rng.random()
+    if style < 0.1:
+        return f"<{p}url>\n  <{p}loc><![CDATA[{url}]]></{p}loc>{lastmod}\n</{p}url>"
+    if style < 0.2:
+        return f"<{p}url><{p}loc>{loc}</{p}loc><image:image><image:loc>https://img.example.com/messi-frauen.jpg" \
+               f"</image:loc></image:image>{lastmod}</{p}url>"
+    if style < 0.25:
+        return f'<!-- messi frauen --><{p}url id="{i}"><{p}loc>{loc}</{p}loc>{lastmod}</{p}url>'
+    if style < 0.3:
+        return f"<{p}url ><{p}loc> {loc} </{p}loc>{lastmod}</{p}url>"
+    if style < 0.35:
+        return f"<{p}url><{p}lastmod>2019-01-01</{p}lastmod><{p}loc>{loc}</{p}loc></{p}url>"
+    return f"<{p}url><{p}loc>{loc}</{p}loc>{lastmod}</{p}url>"
+
+
+def sample_urlset(rng: random.Random, urls: list) -> bytes:
+    """Urlset in einer zufaelligen Schreibweise: CDATA, Kommentare, Bilder, Namespace-Prefix, abgeschnitten."""
+    prefix = rng.choice(["", "", "", "s:"])
+    xmlns = f'xmlns:s="{NAMESPACE}"' if prefix else f'xmlns="{NAMESPACE}"'
+    head = f'<?xml version="1.0" encoding="UTF-8"?>\n<{prefix}urlset {xmlns} xmlns:image="{IMAGE_NAMESPACE}">' \
+           + rng.choice(["", "<!-- fussball messi calcio -->"]) + "\n"
+    items = "\n".join(_item(rng, url, i, prefix) for i, url in enumerate(urls))
+    body = (head + items + f"\n</{prefix}urlset>\n").encode("utf-8")
+    if rng.random() < 0.15:
+        body = body[:rng.randrange(len(body))]
+    return body
+
+
+def _process(config: dict, body: bytes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            return process_sitemap(config, SM_URL, body)
+        except Exception as e:
+            return [type(e).__name__], 0, None
+
+
+def check(seed: int = 1, samples: int = SAMPLES) -> list:
+    """
+    Waechter fuer den Vorfilter: jedes Medium, zufaellige Urlsets aus den
+    URLs im Repo, mit und ohne prefilter muessen dieselben Zeilen liefern.
+    Gibt die Abweichungen als Text zurueck (leer = alles gleich).
+    """
+    rng = random.Random(seed)
+    corpus = _corpus()
+    problems = []
+    for outlet in OUTLETS:
+        on = outlet_config(outlet, start_year=2000, end_year=2030, prefilter=True)
+        off = dict(on, prefilter=False)
+        for i in range(samples):
+            urls = [_mutate(rng, rng.choice(corpus)) for _ in range(rng.choice([1, 5, 50, 300]))]
+            if on["path_prefix"]:
+                urls = [on["path_prefix"] + u.rsplit("/", 1)[-1] if rng.random() < 0.5 else u for u in urls]
+            body = sample_urlset(rng, urls)
+            full, filtered = _process(off, body), _process(on, body)
+            if full[0] != filtered[0] or (full[2] and full[2]["matches"] != filtered[2]["matches"]):
+                problems.append(f"{outlet}: Urlset {i} ergibt {len(filtered[0])} statt {len(full[0])} Zeilen")
+    return problems
+
+
+def bench_prefilter(outlets=None, seed: int = 1) -> list:
+    """Zeit pro Urlset mit NOISE_URLS fremden URLs und HITS Treffern, mit und ohne prefilter."""
+    rng = random.Random(seed)
+    corpus = _corpus()
+    noise = [f"https://www.example.com/{rng.choice(['politik', 'wirtschaft', 'kultur', 'panorama'])}/"
+             f"{rng.randint(2000, 2025)}/artikel-{i}-{rng.getrandbits(48):012x}.html" for i in range(NOISE_URLS)]
+    results = []
+    for outlet in outlets or OUTLETS:
+        on = outlet_config(outlet, start_year=2000, end_year=2030, prefilter=True)
+        off = dict(on, prefilter=False)
+        for hits in HITS:
+            urls = noise + rng.sample(corpus, hits)
+            rng.shuffle(urls)
+            items = "".join(f"<url><loc>{html.escape(u, quote=False)}</loc></url>\n" for u in urls)
+            body = f'<?xml version="1.0"?>\n<urlset xmlns="{NAMESPACE}">\n{items}</urlset>\n'.encode("utf-8")
+            started = time.perf_counter()
+            full = process_sitemap(off, SM_URL, body)
+            middle = time.perf_counter()
+            filtered = process_sitemap(on, SM_URL, body)
+            ended = time.perf_counter()
+            results.append({
+                "outlet": outlet,
+                "hits": hits,
+                "rows": len(full[0]),
+                "same": full == filtered,
+                "full_ms": 1000 * (middle - started),
+                "prefilter_ms": 1000 * (ended - middle),
+            })
+    return results
+
+
+def print_results(results: list):
+    header = f"{'Medium':<16} {'Treffer':>7} {'Zeilen':>6} {'ohne ms':>8} {'mit ms':>7} {'Faktor':>6}  gleich"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        factor = r["full_ms"] / r["prefilter_ms"] if r["prefilter_ms"] else 0.0
+        print(f"{r['outlet']:<16} {r['hits']:>7} {r['rows']:>6} {r['full_ms']:>8.1f} {r['prefilter_ms']:>7.1f} "
+              f"{factor:>6.1f}  {'ja' if r['same'] else 'NEIN'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.prefilter",
+        description="Vorfilter (crawler/prefilter.py) gegen normales Parsen: gleiche Zeilen und Zeit pro Urlset.",
+    )
+    parser.add_argument("outlets", nargs="*", metavar="MEDIUM", help="nur fuer die Zeitmessung (Standard: alle)")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert fuer die Zufalls-Urlsets")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="Urlsets pro Medium im Vergleich")
+    parser.add_argument("--check", action="store_true", help="nur den Vergleich, nicht messen")
+    args = parser.parse_args(argv)
+    unknown = [o for o in args.outlets if o not in OUTLETS]
+    if unknown:
+        parser.error(f"unbekanntes Medium: {', '.join(unknown)}")
+
+    problems = check(args.seed, args.samples)
+    for problem in problems:
+        print(f"FEHLER {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"Vorfilter ok: {args.samples} Urlsets pro Medium wie ohne prefilter")
+    if not args.check:
+        print_results(bench_prefilter(args.outlets, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+import argparse
+import csv
+import glob
+import gzip
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+from classify_rules import OUTLET_RULES
+from reclassify import ROOT, find_url_csvs
+
+# URL-Schema der Sitemaps pro Medium, wie beim Original:
+# index -> (nested ->) child, ohne index laedt der Crawler direkt ueber das Template
+LAYOUTS = {
+    "20min": {
+        "index": "/20min/sitemaps/de/articles.xml",
+        "child": "/20min/sitemaps/de/articles/{year}-{month:02d}-01.xml",
+        "site": "https://www.20min.ch/story/",
+    },
+    "Watson": {
+        "index": "/watson/sitemap.xml",
+        "child": "/watson/sitemap.xml?date={year}{month:02d}",
+        "site": "https://www.watson.ch/sport/fussball/",
+    },
+    "LeMonde": {
+        "index": "/lemonde/sitemap_index.xml",
+        "child": "/lemonde/sitemap/{year}-{month:02d}-01.xml",
+        "site": "https://www.lemonde.fr/football/article/",
+    },
+    "LeFigaro": {
+        "index": "/lefigaro/articles.xml",
+        "child": "/lefigaro/{year}-{month:02d}-01.xml",
+        "site": "https://www.lefigaro.fr/sports/football/",
+    },
+    "Reppubblica": {
+        "index": "/repubblica/sitemap.xml",
+        "child": "/repubblica/sitemap-{year}-{month:02d}.xml.gz",
+        "site": "https://www.repubblica.it/sport/calcio/",
+        "gzip": True,
+    },
+    "aftonbladet": {
+        "index": "/aftonbladet/sitemap.xml",
+        "child": "/aftonbladet/sitemaps/{year}-{month:02d}-articles.xml",
+        "site": "https://www.aftonbladet.se/sportbladet/fotboll/a/",
+    },
+    "jyllands-posten": {
+        "index": "/jyllands-posten/sitemapindex.xml",
+        "child": "/jyllands-posten/sitemap/{year}-{month:02d}-a.xml",
+        "site": "https://jyllands-posten.dk/sport/fodbold/",
+    },
+    "SRF": {
+        "child": "/srf/sitemaps/aron/articles/{year}_{month:02d}.xml",
+        "site": "https://www.srf.ch/sport/fussball/",
+    },
+    "Spiegel": {
+        # Root aus robots.txt, darunter ein Index pro Jahr
+        "index": "/spiegel/sitemap.xml",
+        "nested": "/spiegel/sitemaps/article/sitemap-{year}.xml",
+        "child": "/spiegel/sitemaps/article/sitemap-{year}-{month:02d}.xml.gz",
+        "site": "https://www.spiegel.de/sport/fussball/",
+        "gzip": True,
+    },
+}
+# Woerter fuer URLs ohne Fussball (in keiner Regel)
+FILLER_WORDS = ("wetter", "kultur", "politik", "digital", "reisen", "wissen", "auto", "musik", "kino", "garten")
+URLS_PER_SITEMAP = 1000
+
+
+def overrides_for(outlet: str, base_url: str) -> dict:
+    """Config-Overrides, mit denen run_outlet(outlet) den Stand-in statt der echten Site crawlt."""
+    layout = LAYOUTS[outlet]
+    if outlet == "Spiegel":
+        return {"robots": base_url + "/robots.txt", "sitemap": base_url + layout["index"]}
+    if "index" not in layout:
+        return {"template": base_url + layout["child"]}
+    return {"sitemap": base_url + layout["index"]}
+
+
+def _months(years: tuple) -> list:
+    today = date.today()
+    return [(y, m) for y in range(years[0], years[1] + 1) for m in range(1, 13) if (y, m) <= (today.year, today.month)]
+
+
+def recorded_urls(outlet: str) -> dict:
+    """Fussball-URLs aus den CSVs im Repo als {(Jahr, Monat): [(url, lastmod), ...]}."""
+    by_month = {}
+    for path in find_url_csvs(ROOT, [outlet]):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                month = int(row["month"]) if row.get("month") else i % 12 + 1
+                by_month.setdefault((int(row["year"]), month), []).append((row["url"], row["lastmod"]))
+    return by_month
+
+
+def recorded_counts(outlet: str) -> dict:
+    """Frauen/Herren pro Jahr aus der Counts-CSV (fuer Medien ohne URL-CSV)."""
+    counts = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, outlet, "data", "*_fussball_counts_*.csv"))):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                counts[int(row["year"])] = (int(row["Frauenfussball"]), int(row["Herrenfussball"]))
+    return counts
+
+
+class Fixtures:
+    """
+    Erzeugt die Sitemaps eines Mediums: pro Monat die Fussball-URLs aus
+    den CSVs im Repo (sonst synthetisch nach der Counts-CSV und den Regeln
+    des Mediums) und Fueller ohne Fussball bis urls_per_sitemap. Alles ist
+    deterministisch, gleiche Parameter ergeben gleiche Bytes.
+    """
+
+    def __init__(self, outlet: str, years: tuple, urls_per_sitemap: int = URLS_PER_SITEMAP):
+        self.outlet = outlet
+        self.layout = LAYOUTS[outlet]
+        self.months = _months(years)
+        self.urls_per_sitemap = urls_per_sitemap
+        self.recorded = recorded_urls(outlet)
+        self.counts = {} if self.recorded else recorded_counts(outlet)
+
+    def paths(self) -> dict:
+        """Pfad (mit Query) -> (Art, Jahr, Monat)."""
+        paths = {}
+        if "index" in self.layout:
+            paths[self.layout["index"]] = ("index", None, None)
+        if "nested" in self.layout:
+            for year in sorted({y for y, _m in self.months}):
+                paths[self.layout["nested"].format(year=year)] = ("nested", year, None)
+        for year, month in self.months:
+            paths[self.layout["child"].format(year=year, month=month)] = ("urlset", year, month)
+        return paths
+
+    def index(self, base_url: str, year: int = None) -> bytes:
+        if "nested" in self.layout and year is None:
+            locs = [self.layout["nested"].format(year=y) for y in sorted({y for y, _m in self.months})]
+        else:
+            locs = [self.layout["child"].format(year=y, month=m) for y, m in self.months if year in (None, y)]
+        items = "".join(f"<sitemap><loc>{escape(base_url + loc)}</loc></sitemap>\n" for loc in locs)
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                f"{items}</sitemapindex>\n").encode("utf-8")
+
+    def _football(self, year: int, month: int, rng: random.Random) -> list:
+        if self.recorded:
+            return self.recorded.get((year, month), [])
+        women, men = self.counts.get(year, (0, 0))
+        rules = OUTLET_RULES.get(self.outlet, {"women": set(), "men": set()})
+        lastmod = f"{year}-{month:02d}-15T12:00:00+01:00"
+        urls = []
+        for phrases, n in ((sorted(rules["women"]), women), (sorted(rules["men"]), men)):
+            for i in range(round(n / 12)):
+                urls.append((f"{self.layout['site']}{rng.choice(phrases)}-{year}{month:02d}{i}", lastmod))
+        return urls
+
+    def urlset(self, year: int, month: int) -> bytes:
+        rng = random.Random(f"{self.outlet}-{year}-{month}")
+        entries = list(self._football(year, month, rng))
+        host = self.layout["site"].split("/", 3)[:3]
+        for i in range(max(0, self.urls_per_sitemap - len(entries))):
+            day = i % 28 + 1
+            words = "-".join(rng.sample(FILLER_WORDS, 3))
+            entries.append((f"{'/'.join(host)}/{rng.choice(FILLER_WORDS)}/{words}-{year}{month:02d}{i}",
+                            f"{year}-{month:02d}-{day:02d}T08:00:00+01:00"))
+        rng.shuffle(entries)
+        items = "".join(f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>\n"
+                        for loc, lastmod in entries)
+        body = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                f"{items}</urlset>\n").encode("utf-8")
+        return gzip.compress(body, mtime=0) if self.layout.get("gzip") else body
+
+
+class SitemapServer:
+    """
+    Lokaler HTTP-Server mit den Sitemaps aller (oder der angegebenen)
+    Medien, im eigenen Thread. latency (Sekunden, +/- jitter) verzoegert
+    jede Antwort, error_rate ist der Anteil Urlsets, die mit 503 antworten
+    (immer dieselben), urls_per_sitemap die Groesse eines Urlsets. ETag und
+    If-None-Match (304) werden unterstuetzt.
+
+        with SitemapServer(["Watson"]) as server:
+            run_outlet("Watson", **server.overrides("Watson"))
+    """
+
+    def __init__(self, outlets=None, years: tuple = (2005, date.today().year), urls_per_sitemap: int = URLS_PER_SITEMAP,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, host: str = "127.0.0.1",
+                 port: int = 0):
+        self.outlets = list(outlets or LAYOUTS)
+        self.fixtures = {o: Fixtures(o, years, urls_per_sitemap) for o in self.outlets}
+        self.routes = {}
+        for outlet, fixtures in self.fixtures.items():
+            for path, (kind, year, month) in fixtures.paths().items():
+                self.routes[path] = (outlet, kind, year, month)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}"
+        self._thread = None
+
+    def overrides(self, outlet: str) -> dict:
+        return overrides_for(outlet, self.base_url)
+
+    def robots_txt(self) -> bytes:
+        lines = ["User-agent: *", "Allow: /"]
+        if "Spiegel" in self.fixtures:
+            lines.append(f"Sitemap: {self.base_url}/spiegel/sitemaps/news-de.xml")
+            lines.append(f"Sitemap: {self.base_url}{LAYOUTS['Spiegel']['index']}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def body(self, path: str):
+        """Bytes fuer path oder None (404); Urlsets werden einmal erzeugt und gemerkt."""
+        if path == "/robots.txt":
+            return self.robots_txt()
+        route = self.routes.get(path)
+        if route is None:
+            return None
+        with self._lock:
+            body = self._bodies.get(path)
+        if body is None:
+            outlet, kind, year, month = route
+            fixtures = self.fixtures[outlet]
+            if kind == "urlset":
+                body = fixtures.urlset(year, month)
+            else:
+                body = fixtures.index(self.base_url, year)
+            with self._lock:
+                self._bodies[path] = body
+        return body
+
+    def failing(self, path: str) -> bool:
+        route = self.routes.get(path)
+        return bool(route and route[1] == "urlset" and zlib.crc32(path.encode("utf-8")) % 10000 < self.error_rate * 10000)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency or server.jitter:
+                    time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+                if server.failing(self.path):
+                    return self._send(503, b"")
+                body = server.body(self.path)
+                if body is None:
+                    return self._send(404, b"")
+                etag = f'"{zlib.crc32(body):08x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", etag)
+                self._send(200, body, etag)
+
+            def _send(self, status: int, body: bytes, etag: str = ""):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.server", description="Lokaler Stand-in fuer die Sitemaps.")
+    parser.add_argument("outlets", nargs="*", metavar="MEDIUM", help=f"Standard: alle ({', '.join(LAYOUTS)})")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--urls", type=int, default=URLS_PER_SITEMAP, help="URLs pro Urlset")
+    parser.add_argument("--latency", type=float, default=0.0, help="Sekunden pro Antwort")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- Sekunden auf latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil Urlsets mit 503")
+    args = parser.parse_args(argv)
+    unknown = [o for o in args.outlets if o not in LAYOUTS]
+    if unknown:
+        parser.error(f"unbekanntes Medium: {', '.join(unknown)}")
+
+    server = SitemapServer(args.outlets, urls_per_sitemap=args.urls, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, port=args.port)
+    print(f"[INFO] Stand-in auf {server.base_url}")
+    for outlet in server.outlets:
+        print(f"  {outlet}: {server.overrides(outlet)}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import json
+import os
+
+
+class CheckpointJournal:
+    """
+    Journal der fertig verarbeiteten Sitemaps (eine JSON-Zeile pro Sitemap:
+    URL, Anzahl Eintraege, Zeilenstand der URL-CSV danach). Nach einem
+    Abbruch werden diese Sitemaps uebersprungen und die CSV wird ab dem
+    letzten Zeilenstand weitergeschrieben.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = {}
+        self.rows = 0
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # halb geschriebene letzte Zeile vom Abbruch
+                    break
+                self.done[entry["sitemap"]] = entry
+                self.rows = entry["rows"]
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.done)
+
+    def __contains__(self, sitemap_url: str) -> bool:
+        return sitemap_url in self.done
+
+    def record(self, sitemap_url: str, entries: int, rows: int):
+        """rows ist der Zeilenstand der URL-CSV, nachdem diese Sitemap geschrieben ist."""
+        entry = {"sitemap": sitemap_url, "entries": entries, "rows": rows}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done[sitemap_url] = entry
+        self.rows = rows
+
+    def reset(self):
+        """Journal verwerfen (z.B. weil die URL-CSV nicht mehr dazu passt)."""
+        self._file.close()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.done = {}
+        self.rows = 0
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def finish(self):
+        """Crawl komplett: Journal loeschen, der naechste Lauf beginnt von vorne."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def journal_path(urls_csv: str) -> str:
+    return urls_csv + ".checkpoint.jsonl"
@@ -1,4 +1,13 @@
 import re
+from array import array
+from collections import deque
+from itertools import islice
+from urllib.parse import unquote
+
+try:
+    import numpy as np
+except ImportError:  # optional, classify_many liefert dann array.array
+    np = None
 
 EXCLUDE_FRAU = {
     "spielerfrau",
@@ -150,6 +159,159 @@ ITALIAN_MEN = {
     "supercoppa",
 }
 
+# Swedish / Danish: Frauen nur mit Fussball-Kontext, andere Sportarten ausgeschlossen
+SWEDISH_WOMEN = {
+    "damfotboll",
+    "damallsvenskan",
+    "damlandslag",
+    "damlandslaget",
+    "damlandslagetfotboll",
+    "damfotbollslandslaget",
+    "dam",
+    "kvinn",
+    "kvinnor",
+    "wsl",
+    "nwsl",
+}
+
+SWEDISH_MEN = {
+    "herrfotboll",
+    "herrlandslag",
+    "herrlandslaget",
+    "allsvenskan",
+    "superettan",
+    "premier-league",
+    "champions-league",
+    "europa-league",
+    "fa-cup",
+}
+
+SWEDISH_SOCCER = {
+    "fotboll",
+    "football",
+    "soccer",
+}
+
+SWEDISH_WOMEN_SOCCER_HINTS = {
+    "damfotboll",
+    "damallsvenskan",
+    "damlandslag",
+    "damlandslaget",
+    "dam",
+    "kvinn",
+    "kvinnor",
+    "wsl",
+    "nwsl",
+}
+
+SWEDISH_EXCLUDE_SPORTS = {
+    "handboll",
+    "handball",
+    "basket",
+    "basketboll",
+    "ishockey",
+    "hockey",
+    "innebandy",
+    "bandy",
+    "skidor",
+    "skidskytte",
+    "alpint",
+    "tennis",
+    "badminton",
+    "golf",
+    "formel1",
+    "formula1",
+    "f1",
+    "motorsport",
+}
+
+DANISH_WOMEN_NAMES = {
+    "rapinoe",
+    "morgan",
+    "hegerberg",
+    "miedema",
+    "putellas",
+    "bonmati",
+    "kerr",
+    "marta",
+    "kirby",
+    "mead",
+    "bronze",
+    "hamm",
+    "popp",
+    "oberdorf",
+    "hasegawa",
+    "foord",
+    "graham",
+    "rodman",
+    "lavelle",
+    "press",
+}
+
+DANISH_WOMEN = {
+    "kvindefodbold",
+    "kvindeligaen",
+    "kvindelandshold",
+    "kvindelandsholdet",
+    "wsl",
+    "nwsl",
+}
+
+DANISH_MEN = {
+    "herrefodbold",
+    "herrelandshold",
+    "herrelandsholdet",
+    "superligaen",
+    "superliga",
+    "1-division",
+    "2-division",
+    "premier-league",
+    "champions-league",
+    "europa-league",
+    "fa-cup",
+}
+
+DANISH_SOCCER = {
+    "fodbold",
+    "football",
+    "soccer",
+}
+
+DANISH_WOMEN_SOCCER_HINTS = {
+    "kvindefodbold",
+    "kvindeligaen",
+    "kvindelandshold",
+    "kvindelandsholdet",
+    "wsl",
+    "nwsl",
+}
+
+DANISH_EXCLUDE_SPORTS = {
+    "handbold",
+    "haandbold",
+    "handball",
+    "basketball",
+    "basket",
+    "ishockey",
+    "hockey",
+    "tennis",
+    "badminton",
+    "volleyball",
+    "cykling",
+    "cycling",
+    "golf",
+    "formel1",
+    "formula1",
+    "f1",
+    "motorsport",
+    "atletik",
+    "atletics",
+    "H%C3%A5ndbold",
+}
+
+SWEDISH_FOLD = [("\u00e5", "a"), ("\u00e4", "a"), ("\u00f6", "o"), ("\u00e6", "ae"), ("\u00f8", "o")]
+DANISH_FOLD = [("\u00e5", "aa"), ("\u00e6", "ae"), ("\u00f8", "o"), ("\u00e4", "a"), ("\u00f6", "o")]
+
 OUTLET_RULES = {
     "Spiegel": {"women": GERMAN_WOMEN, "men": GERMAN_MEN},
     "SRF": {"women": GERMAN_WOMEN, "men": GERMAN_MEN},
@@ -158,32 +320,352 @@ OUTLET_RULES = {
     "LeMonde": {"women": FRENCH_WOMEN, "men": FRENCH_MEN},
     "LeFigaro": {"women": FRENCH_WOMEN, "men": FRENCH_MEN},
     "Reppubblica": {"women": ITALIAN_WOMEN, "men": ITALIAN_MEN},
+    "aftonbladet": {
+        "women": SWEDISH_WOMEN,
+        "men": SWEDISH_MEN,
+        "women_names": set(),
+        "women_context": SWEDISH_SOCCER | SWEDISH_WOMEN_SOCCER_HINTS,
+        "exclude_sports": SWEDISH_EXCLUDE_SPORTS,
+        "require_path": "/sportbladet/fotboll/",
+        "fold": SWEDISH_FOLD,
+    },
+    "jyllands-posten": {
+        "women": DANISH_WOMEN,
+        "men": DANISH_MEN,
+        "women_names": DANISH_WOMEN_NAMES,
+        "women_context": DANISH_SOCCER | DANISH_WOMEN_SOCCER_HINTS,
+        "exclude_sports": DANISH_EXCLUDE_SPORTS,
+        "fold": DANISH_FOLD,
+    },
 }
 
 
-def tokenize(url: str) -> set[str]:
-    lower = url.lower()
-    cleaned = re.sub(r"[^a-z0-9]+", " ", lower)
-    return set(t for t in cleaned.split() if t)
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+CATEGORIES = ("Herrenfussball", "Frauenfussball")
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+# URLs pro translate in classify_many (haelt den zusammengefuegten Text klein)
+BATCH_URLS = 50000
+TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+def _fold_map(char: str, fold) -> str:
+    text = char.lower()
+    for src, repl in fold:
+        text = text.replace(src, repl)
+    return "".join(c if c in TOKEN_CHARS else " " for c in text)
+
+
+class Normalizer:
+    """
+    URL -> Tokens: unquote (decode), dann eine str.translate-Tabelle fuer
+    lower, fold und Trenner, dann split(). Gleiche Tokens wie TOKEN_RE auf
+    unquote + lower + fold, aber ohne Zwischenstring pro Ersetzung.
+    """
+
+    # ASCII bis Latin Extended-A stehen fest in der Tabelle, seltenere
+    # Zeichen kommen beim ersten Auftreten dazu
+    PRESET = 0x180
+
+    def __init__(self, fold=None, decode=None):
+        self.fold = tuple(fold or ())
+        # ohne fold wird nicht entpackt (so wurden die CSVs im Repo erzeugt)
+        self.decode = bool(self.fold) if decode is None else decode
+        # ein normales dict: str.translate ist mit Unterklassen deutlich langsamer
+        self.table = {code: _fold_map(chr(code), self.fold) for code in range(self.PRESET)}
+        # fuer token_lines: gleiche Tabelle, aber "\n" bleibt als Zeilengrenze stehen
+        self.line_table = dict(self.table)
+        self.line_table[ord("\n")] = "\n"
+
+    def _translate(self, text: str, table: dict) -> str:
+        translated = text.translate(table)
+        if not translated.isascii():
+            # Zeichen ohne Eintrag bleiben stehen, alle Eintraege sind ASCII
+            for char in set(translated):
+                if not char.isascii():
+                    self.table[ord(char)] = self.line_table[ord(char)] = _fold_map(char, self.fold)
+            translated = text.translate(table)
+        return translated
+
+    def tokens(self, url: str) -> list[str]:
+        if self.decode:
+            url = unquote(url)
+        return self._translate(url, self.table).split()
+
+    def token_lines(self, urls: list):
+        """tokens() fuer viele URLs, mit einem unquote und translate ueber alle zusammen."""
+        text = "\n".join(urls)
+        if self.decode:
+            text = unquote(text)
+        if text.count("\n") != len(urls) - 1:
+            # Zeilenumbruch in einer URL (auch als %0A): einzeln
+            for url in urls:
+                yield self.tokens(url)
+        elif not text.isascii():
+            # translate ist fuer Nicht-ASCII viel langsamer: nur diese Zeilen einzeln
+            for line in text.split("\n"):
+                yield self._translate(line, self.table).split()
+        else:
+            for line in text.translate(self.line_table).split("\n"):
+                yield line.split()
+
+
+_normalizers = {}
+
+
+def normalizer_for(fold=None, decode=None) -> Normalizer:
+    key = (tuple(fold or ()), decode)
+    normalizer = _normalizers.get(key)
+    if normalizer is None:
+        normalizer = _normalizers[key] = Normalizer(fold, decode)
+    return normalizer
+
+
+def token_list(url: str, fold=None) -> list[str]:
+    return normalizer_for(fold).tokens(url)
+
+
+def tokenize(url: str, fold=None) -> set[str]:
+    return set(token_list(url, fold))
+
+
+def phrase_key(phrase: str) -> str:
+    # "frauen-em" -> "frauen em", so wie die Tokens in der URL stehen
+    return " ".join(TOKEN_RE.findall(phrase.lower()))
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick-Automat ueber URL-Tokens. Findet Einzel-Tokens und
+    Mehrwort-Regeln wie "frauen-em" in einem Durchlauf pro URL. Jede Regel
+    hat ein Bit im Vokabular (bits), find_mask() liefert die Treffer als int.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = frozenset(phrase_key(p) for p in phrases) - {""}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for phrase in self.phrases:
+            state = 0
+            for token in phrase.split(" "):
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][token] = nxt
+                state = nxt
+            self._out[state] = (phrase,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        # sortiert, damit die Bits in jedem Prozess gleich sind
+        self.bits = {phrase: 1 << i for i, phrase in enumerate(sorted(self.phrases))}
+        self._out_mask = [self.mask(out) for out in self._out]
+
+    def mask(self, phrases) -> int:
+        """Bitmaske einer Regelgruppe (Schluessel wie phrase_key)."""
+        bits = self.bits
+        mask = 0
+        for phrase in phrases:
+            mask |= bits[phrase]
+        return mask
+
+    def find(self, tokens) -> set[str]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = set()
+        state = 0
+        for token in tokens:
+            nxt = goto[state].get(token)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(token)
+            if nxt is None:
+                continue
+            state = nxt
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def find_mask(self, tokens) -> int:
+        # jeder Treffer beginnt mit einem Uebergang aus dem Startzustand
+        if self._goto[0].keys().isdisjoint(tokens):
+            return 0
+        goto = self._goto
+        fail = self._fail
+        out_mask = self._out_mask
+        mask = 0
+        state = 0
+        for token in tokens:
+            nxt = goto[state].get(token)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(token)
+            if nxt is None:
+                continue
+            state = nxt
+            mask |= out_mask[state]
+        return mask
+
+
+_phrase_matcher = None
+
+
+def all_rule_phrases() -> set[str]:
+    phrases = set(EXCLUDE_FRAU) | WOMEN_NAMES | MEN_NAMES
+    for rules in OUTLET_RULES.values():
+        for key in ("women", "men", "women_names", "women_context", "exclude_sports"):
+            phrases |= rules.get(key, set())
+    return phrases
+
+
+def phrase_matcher() -> PhraseMatcher:
+    """Ein gemeinsamer Automat fuer alle Regeln aus OUTLET_RULES."""
+    global _phrase_matcher
+    if _phrase_matcher is None:
+        _phrase_matcher = PhraseMatcher(all_rule_phrases())
+    return _phrase_matcher
+
+
+def _keys(phrases) -> frozenset:
+    return frozenset(phrase_key(p) for p in phrases)
+
+
+class OutletClassifier:
+    """
+    Regeln eines Mediums, einmal zu Bitmasken ueber das Vokabular des
+    Automaten kompiliert: eine URL wird zu einer Maske (mask()), Treffer
+    und Kategorie sind dann ein paar AND-Operationen. Optionale Regel-Keys:
+    women_names, women_context (Frauen nur mit diesem Kontext),
+    exclude_sports, require_path, fold (Umlaute fuer tokenize) und
+    decode (%-Sequenzen entpacken, Standard: nur mit fold).
+    """
+
+    def __init__(self, rules: dict):
+        self.women = _keys(rules["women"] | rules.get("women_names", WOMEN_NAMES))
+        self.men = _keys(rules["men"] | MEN_NAMES)
+        self.men_or_exclude = self.men | _keys(EXCLUDE_FRAU)
+        self.women_context = _keys(rules.get("women_context", ()))
+        self.exclude_sports = _keys(rules.get("exclude_sports", ()))
+        self.require_path = rules.get("require_path", "")
+        self.fold = rules.get("fold")
+        self.normalizer = normalizer_for(self.fold, rules.get("decode"))
+        # mindestens eines dieser Tokens steht in jeder URL, die match() annimmt
+        # (pro Regel das laengste Token, "2 bundesliga" -> "bundesliga")
+        self.triggers = frozenset(max(p.split(" "), key=len) for p in self.women | self.men_or_exclude)
+        phrases = self.women | self.men_or_exclude | self.women_context | self.exclude_sports
+        self.matcher = phrase_matcher()
+        if not phrases <= self.matcher.phrases:
+            self.matcher = PhraseMatcher(phrases)
+        self.women_mask = self.matcher.mask(self.women)
+        self.men_or_exclude_mask = self.matcher.mask(self.men_or_exclude)
+        self.women_context_mask = self.matcher.mask(self.women_context)
+        self.exclude_sports_mask = self.matcher.mask(self.exclude_sports)
+
+    def tokens(self, url: str) -> set[str]:
+        """Alle Regel-Begriffe (auch Mehrwort-Regeln), die in der URL vorkommen."""
+        return self.matcher.find(self.normalizer.tokens(url))
+
+    def mask(self, url: str) -> int:
+        """Die Regel-Begriffe aus tokens() als Bitmaske."""
+        return self.matcher.find_mask(self.normalizer.tokens(url))
+
+    def _is_women(self, mask: int) -> bool:
+        if not mask & self.women_mask:
+            return False
+        return not self.women_context_mask or bool(mask & self.women_context_mask)
+
+    def _match_mask(self, mask: int) -> bool:
+        if mask & self.exclude_sports_mask:
+            return False
+        if mask & self.men_or_exclude_mask:
+            return True
+        return self._is_women(mask)
+
+    def _classify_mask(self, mask: int) -> str:
+        if mask & self.exclude_sports_mask:
+            return "Herrenfussball"
+        if self._is_women(mask):
+            return "Frauenfussball"
+        return "Herrenfussball"
+
+    def match(self, url: str) -> bool:
+        if self.require_path and self.require_path not in url:
+            return False
+        return self._match_mask(self.mask(url))
+
+    def classify(self, url: str) -> str:
+        if self.require_path and self.require_path not in url:
+            return "Herrenfussball"
+        return self._classify_mask(self.mask(url))
+
+    def match_and_classify(self, url: str):
+        """Kategorie oder None, wenn die URL kein Fussball-Treffer ist."""
+        if self.require_path and self.require_path not in url:
+            return None
+        mask = self.mask(url)
+        if not self._match_mask(mask):
+            return None
+        return self._classify_mask(mask)
+
+    def classify_codes(self, urls: list) -> bytearray:
+        """classify() fuer eine Liste von URLs, als Codes (Index in CATEGORIES)."""
+        path = self.require_path
+        find_mask = self.matcher.find_mask
+        codes = bytearray([CATEGORY_CODES[self._classify_mask(0)]]) * len(urls)
+        for i, tokens in enumerate(self.normalizer.token_lines(urls)):
+            # ohne Regel-Token (die meisten URLs) bleibt es beim Code fuer Maske 0
+            mask = find_mask(tokens)
+            if mask and (not path or path in urls[i]):
+                codes[i] = CATEGORY_CODES[self._classify_mask(mask)]
+        return codes
+
+
+_classifiers = {}
+
+
+def classifier_for(outlet: str) -> OutletClassifier:
+    classifier = _classifiers.get(outlet)
+    if classifier is None:
+        rules = OUTLET_RULES.get(outlet, {"women": set(), "men": set()})
+        classifier = _classifiers[outlet] = OutletClassifier(rules)
+    return classifier
 
 
 def matches_rules(url: str, outlet: str) -> bool:
-    tokens = tokenize(url)
-    rules = OUTLET_RULES.get(outlet, {"women": set(), "men": set()})
-    women_tokens = rules["women"] | WOMEN_NAMES
-    men_tokens = rules["men"] | MEN_NAMES
-    return bool(tokens & (women_tokens | men_tokens | EXCLUDE_FRAU))
+    return classifier_for(outlet).match(url)
 
 
 def classify_url(url: str, outlet: str) -> str:
-    tokens = tokenize(url)
-    rules = OUTLET_RULES.get(outlet, {"women": set(), "men": set()})
-    women_tokens = rules["women"] | WOMEN_NAMES
-    men_tokens = rules["men"] | MEN_NAMES
-    if tokens & women_tokens:
-        return "Frauenfussball"
-    if tokens & EXCLUDE_FRAU:
-        return "Herrenfussball"
-    if tokens & men_tokens:
-        return "Herrenfussball"
-    return "Herrenfussball"
+    return classifier_for(outlet).classify(url)
+
+
+def classify_many(urls, outlet: str, batch_size: int = BATCH_URLS):
+    """
+    classify_url fuer eine ganze Spalte (Liste, Generator, numpy-Array):
+    ein Code pro URL, CATEGORIES[code] ist die Kategorie. Mit numpy ein
+    uint8-Array, sonst array.array("B").
+    """
+    classifier = classifier_for(outlet)
+    urls = iter(urls)
+    codes = bytearray()
+    while True:
+        batch = list(islice(urls, batch_size))
+        if not batch:
+            break
+        codes += classifier.classify_codes(batch)
+    if np is None:
+        return array("B", codes)
+    return np.frombuffer(codes, dtype=np.uint8)
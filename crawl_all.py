@@ -0,0 +1,5 @@
+from crawler.scheduler import main
+
+# python crawl_all.py [Medium ...] [--out-dir ordner] [--workers n]
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from http_cache import has_frozen
+from http_client import fetch as fetch_url
+from http_client import decompressed_size, fetch_cached, host_of
+from rate_limit import honour_robots, limiter_for
+
+REQUESTS_PER_SECOND = 5.0
+MAX_CONCURRENCY = 4
+BURST = 1
+# Plaetze in den Queues zwischen den Stufen; pro Platz liegt eine ganze Sitemap im Speicher
+QUEUE_SIZE = 8
+PARSE_WORKERS = 4
+STAGES = ("fetch", "parse", "write")
+# Antwort von Pipeline(fetch=...), wenn sich die Sitemap nicht geaendert hat
+UNCHANGED = object()
+
+
+class HostBudget:
+    """
+    Politeness pro Host: hoechstens max_concurrency offene Requests und
+    ein Token-Bucket mit requests_per_second (siehe rate_limit).
+    """
+
+    def __init__(self, url: str, requests_per_second: float, max_concurrency: int, burst: int = BURST):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = limiter_for(url, requests_per_second, burst)
+
+    async def wait_turn(self):
+        await self.bucket.acquire_async()
+
+
+class StageCounter:
+    """
+    Durchsatz einer Stufe: Sitemaps, Bytes, Zeilen, Arbeitszeit (ueber alle
+    Worker summiert) und Wartezeit, weil die naechste Stufe voll war
+    (Backpressure).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self.rows = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.started = None
+        self.finished = None
+
+    def add(self, n_bytes: int, seconds: float, rows: int = 0):
+        now = time.time()
+        if self.started is None:
+            self.started = now - seconds
+        self.finished = now
+        self.items += 1
+        self.bytes += n_bytes
+        self.rows += rows
+        self.busy += seconds
+
+    def per_second(self) -> float:
+        if self.started is None or self.finished <= self.started:
+            return 0.0
+        return self.items / (self.finished - self.started)
+
+    def as_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "bytes": self.bytes,
+            "rows": self.rows,
+            "busy": round(self.busy, 3),
+            "blocked": round(self.blocked, 3),
+            "per_second": round(self.per_second(), 3),
+        }
+
+    def __str__(self):
+        return f"{self.name}: {self.items} Sitemaps, {self.bytes / 1e6:.1f} MB, {self.rows} Zeilen, " \
+               f"{self.per_second():.1f}/s, " \
+               f"Arbeit {self.busy:.1f}s, blockiert {self.blocked:.1f}s"
+
+
+def new_counters() -> dict:
+    return {name: StageCounter(name) for name in STAGES}
+
+
+class Pipeline:
+    """
+    fetch -> parse -> write mit begrenzten Queues dazwischen.
+
+    fetch laeuft async (pro Host begrenzt), parse ruft process(sm_url, body)
+    im executor auf (Threads oder Prozesse; parsen, filtern, klassifizieren)
+    und muss (rows, entries, info) liefern. write ist ein einzelner Schreiber,
+    der in der Reihenfolge der Eingabe in den Sink (und das Journal) schreibt
+    und on_result(sm_url, rows, info) aufruft. Ist eine Queue voll, wartet
+    die Stufe davor; ausserdem sind nie mehr als max_pending Sitemaps
+    zwischen fetch und write unterwegs.
+
+    Fuer einen ProcessPoolExecutor: raw=True gibt die Bytes wie vom Server
+    weiter (gzip entpackt dann process im Worker), expand macht aus den
+    kompakten Zeilen des Workers erst beim Schreiben dicts, und Sitemaps
+    unter inline_below Bytes (entpackt gezaehlt) werden im Thread
+    verarbeitet, weil sich der Weg in einen anderen Prozess fuer sie nicht
+    lohnt.
+
+    fetch ersetzt das Laden (url -> Bytes); liefert es None, ist die
+    Sitemap unveraendert und wird ohne Zeilen als erledigt geschrieben.
+    Ein eigenes fetch geht immer ueber das Rate-Limit, auch fuer URLs,
+    die eingefroren im Cache liegen. expected_failure(sm_url, error) sagt,
+    ob ein Ladefehler erwartet ist (dann ohne Warnung).
+    """
+
+    def __init__(self, process, executor=None, parse_workers: int = PARSE_WORKERS, queue_size: int = QUEUE_SIZE,
+                 max_pending: int = None, sink=None, journal=None, progress=None, on_result=None,
+                 max_rows: int = None, counters: dict = None, raw: bool = False, expand=None,
+                 inline_below: int = 0, fetch=None, expected_failure=None):
+        self.process = process
+        self.executor = executor
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.max_pending = max_pending or 4 * queue_size
+        self.sink = sink
+        self.journal = journal
+        self.progress = progress
+        self.on_result = on_result
+        self.max_rows = max_rows
+        self.counters = counters if counters is not None else new_counters()
+        self.raw = raw
+        self.expand = expand
+        self.inline_below = inline_below
+        self.fetch = fetch or (fetch_cached if raw else fetch_url)
+        # nur die Standard-Fetches lesen eingefrorene Cache-Eintraege ohne Request
+        self.cache_aware = fetch is None
+        self.expected_failure = expected_failure
+        self.rows = []
+        self.written = 0
+        self.stopped = False
+
+    async def _put(self, queue: asyncio.Queue, item, counter: StageCounter):
+        started = time.time()
+        await queue.put(item)
+        counter.blocked += time.time() - started
+
+    async def _parse_stage(self, executor, fetched: asyncio.Queue, parsed: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        counter = self.counters["parse"]
+        while True:
+            item = await fetched.get()
+            if item is None:
+                return
+            idx, sm_url, body = item
+            result = None
+            if body is UNCHANGED:
+                result = ((), 0, None)
+            elif body is not None:
+                started = time.time()
+                # gzip zaehlt entpackt: ein kleines .xml.gz kann ein grosses Urlset sein
+                target = executor if decompressed_size(body) >= self.inline_below else None
+                try:
+                    result = await loop.run_in_executor(target, self.process, sm_url, body)
+                except Exception as e:
+                    print(f"[WARN] Failed sitemap: {sm_url} -> {e}")
+                counter.add(len(body), time.time() - started, len(result[0]) if result else 0)
+            await self._put(parsed, (idx, sm_url, result), counter)
+
+    def _write(self, sm_url: str, result):
+        if result is None or self.stopped:
+            # fehlgeschlagen: nicht ins Journal, beim Fortsetzen nochmals laden
+            return
+        rows, entries, info = result
+        if self.expand is not None:
+            rows = self.expand(rows)
+        if self.on_result is not None:
+            self.on_result(sm_url, rows, info)
+        if self.max_rows is not None and self.written + len(rows) >= self.max_rows:
+            rows = rows[:self.max_rows - self.written]
+            print("[INFO] MAX_URLS erreicht – Stop.")
+            self.stopped = True
+        if self.sink is not None:
+            self.sink.write_many(rows)
+        else:
+            self.rows.extend(rows)
+        self.written += len(rows)
+        if self.journal is not None and not self.stopped:
+            # erst auf Platte, dann ins Journal
+            self.sink.flush()
+            self.journal.record(sm_url, entries, self.sink.rows)
+
+    async def _write_stage(self, parsed: asyncio.Queue, window: asyncio.Semaphore, total):
+        counter = self.counters["write"]
+        pending = {}
+        next_idx = 0
+        while True:
+            item = await parsed.get()
+            if item is None:
+                return
+            idx, sm_url, result = item
+            pending[idx] = (sm_url, result)
+            # fertige Sitemaps in Eingabe-Reihenfolge schreiben
+            while next_idx in pending:
+                sm_url, result = pending.pop(next_idx)
+                started = time.time()
+                before = self.written
+                self._write(sm_url, result)
+                counter.add(0, time.time() - started, self.written - before)
+                next_idx += 1
+                window.release()
+                if self.progress is not None:
+                    self.progress(next_idx, total)
+
+    async def _run_stages(self, produce, total):
+        fetched = asyncio.Queue(self.queue_size)
+        parsed = asyncio.Queue(self.queue_size)
+        window = asyncio.Semaphore(self.max_pending)
+        own_executor = self.executor is None
+        executor = ThreadPoolExecutor(self.parse_workers) if own_executor else self.executor
+        parsers = [asyncio.create_task(self._parse_stage(executor, fetched, parsed))
+                   for _ in range(self.parse_workers)]
+        writer = asyncio.create_task(self._write_stage(parsed, window, total))
+
+        async def upstream():
+            await produce(fetched, window)
+            for _ in parsers:
+                await fetched.put(None)
+            await asyncio.gather(*parsers)
+            await parsed.put(None)
+
+        try:
+            await asyncio.gather(upstream(), writer)
+        finally:
+            for task in (writer, *parsers):
+                task.cancel()
+            if own_executor:
+                executor.shutdown()
+        return self.sink.rows if self.sink is not None else self.rows
+
+    async def _budget(self, budgets: dict, url: str, requests_per_second: float, max_concurrency: int,
+                      respect_robots: bool) -> HostBudget:
+        host = host_of(url)
+        if host not in budgets:
+            # Crawl-delay vor dem Anlegen des Buckets uebernehmen
+            if respect_robots:
+                await asyncio.to_thread(honour_robots, host)
+            budgets[host] = HostBudget(host, requests_per_second, max_concurrency)
+        return budgets[host]
+
+    async def _fetch_body(self, budget: HostBudget, sm_url: str):
+        """Laedt sm_url im Budget des Hosts: Bytes, UNCHANGED oder None bei Fehler."""
+        async with budget.semaphore:
+            if not (self.cache_aware and has_frozen(sm_url)):
+                await budget.wait_turn()
+            started = time.time()
+            try:
+                body = await asyncio.to_thread(self.fetch, sm_url)
+            except Exception as e:
+                if self.expected_failure is None or not self.expected_failure(sm_url, e):
+                    print(f"[WARN] Failed sitemap: {sm_url} -> {e}")
+                return None
+            self.counters["fetch"].add(len(body or b""), time.time() - started)
+        return UNCHANGED if body is None else body
+
+    async def run(self, sitemap_urls, requests_per_second=REQUESTS_PER_SECOND, max_concurrency=MAX_CONCURRENCY,
+                  respect_robots=True, stream: bool = False):
+        """
+        Laedt sitemap_urls selbst (pro Host begrenzt) und gibt sie an die
+        Parse-Stufe. Mit stream=True wird sitemap_urls erst beim Laden
+        abgefragt (die ersten Requests laufen, bevor die Liste fertig ist),
+        dafuer kennt progress die Gesamtzahl nicht.
+        """
+        if stream:
+            urls = iter(sitemap_urls)
+            total = None
+        else:
+            # iter_sitemaps() laedt zuerst den Index (blockierend), daher im Thread
+            urls = await asyncio.to_thread(list, sitemap_urls)
+            if self.journal is not None:
+                urls = [u for u in urls if u not in self.journal]
+            total = len(urls)
+            urls = iter(urls)
+        budgets = {}
+        counter = self.counters["fetch"]
+
+        async def fetch_one(idx: int, sm_url: str, budget: HostBudget, fetched: asyncio.Queue):
+            body = await self._fetch_body(budget, sm_url)
+            await self._put(fetched, (idx, sm_url, body), counter)
+
+        async def produce(fetched: asyncio.Queue, window: asyncio.Semaphore):
+            tasks = set()
+            idx = 0
+            while True:
+                await window.acquire()
+                if self.stopped:
+                    break
+                sm_url = await asyncio.to_thread(next, urls, None) if stream else next(urls, None)
+                if sm_url is None:
+                    break
+                if stream and self.journal is not None and sm_url in self.journal:
+                    window.release()
+                    continue
+                budget = await self._budget(budgets, sm_url, requests_per_second, max_concurrency, respect_robots)
+                task = asyncio.create_task(fetch_one(idx, sm_url, budget, fetched))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                idx += 1
+            await asyncio.gather(*tasks)
+
+        return await self._run_stages(produce, total)
+
+    async def run_tree(self, roots, children, requests_per_second=REQUESTS_PER_SECOND,
+                       max_concurrency=MAX_CONCURRENCY, max_sitemaps: int = None, respect_robots=True):
+        """
+        Laeuft verschachtelte Sitemap-Indizes ab roots ab (Breitensuche ueber
+        eine deque). Es werden so viele Sitemaps gleichzeitig geladen, wie das
+        Budget des Hosts erlaubt, Indizes und Urlsets gemischt.
+
+        children(sm_url, body) laeuft im Fetch-Thread und gibt fuer einen Index
+        die gewuenschten Kinder zurueck (schon nach Jahr gefiltert, bevor sie in
+        die Frontier kommen), fuer ein Urlset None; nur Urlsets gehen an die
+        Parse-Stufe. Die Kinder eines Index kommen erst in die Frontier, wenn
+        alle frueher gestarteten Sitemaps fertig sind: die Reihenfolge ist die
+        einer Breitensuche nacheinander, egal welcher Request zuerst fertig
+        wird, und in dieser Reihenfolge wird geschrieben. Jede URL wird
+        hoechstens einmal besucht, Sitemaps im Journal gar nicht geladen;
+        max_sitemaps begrenzt die besuchten Sitemaps (Indizes mitgezaehlt).
+        """
+        frontier = deque(roots)
+        seen = set()
+        budgets = {}
+        tasks = set()
+        counter = self.counters["fetch"]
+        # Kinder pro idx, bis alle kleineren idx fertig sind
+        finished = {}
+        next_release = 0
+
+        def release(idx: int, found):
+            nonlocal next_release
+            finished[idx] = found
+            while next_release in finished:
+                frontier.extend(finished.pop(next_release))
+                next_release += 1
+
+        async def fetch_node(idx: int, sm_url: str, budget: HostBudget, fetched: asyncio.Queue):
+            found = None
+            try:
+                body = await self._fetch_body(budget, sm_url)
+                if body is not None and body is not UNCHANGED:
+                    try:
+                        found = await asyncio.to_thread(children, sm_url, body)
+                    except Exception as e:
+                        print(f"[WARN] Sitemap fetch/parse failed: {sm_url} -> {e}")
+                        found = ()
+                    if found is not None:
+                        # Index: nichts zu parsen und nicht ins Journal (beim Fortsetzen neu ablaufen)
+                        body = None
+            finally:
+                release(idx, found or ())
+            await self._put(fetched, (idx, sm_url, body), counter)
+
+        async def produce(fetched: asyncio.Queue, window: asyncio.Semaphore):
+            idx = 0
+            while not self.stopped:
+                if not frontier:
+                    if not tasks:
+                        break
+                    # laufende Indizes koennen noch Kinder liefern
+                    await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                if max_sitemaps is not None and len(seen) >= max_sitemaps:
+                    break
+                sm_url = frontier.popleft()
+                if sm_url in seen:
+                    continue
+                seen.add(sm_url)
+                if self.journal is not None and sm_url in self.journal:
+                    continue
+                budget = await self._budget(budgets, sm_url, requests_per_second, max_concurrency, respect_robots)
+                await window.acquire()
+                if self.stopped:
+                    break
+                task = asyncio.create_task(fetch_node(idx, sm_url, budget, fetched))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                idx += 1
+            await asyncio.gather(*tasks)
+
+        return await self._run_stages(produce, None)
+
@@ -0,0 +1,8 @@
+"""
+Gemeinsamer Crawler fuer alle Medien. Pro Medium gibt es nur eine
+Konfiguration in outlets.OUTLETS; Abruf, Parsen, Klassifikation und
+CSV-Export sind fuer alle gleich.
+"""
+from .outlets import DEFAULTS, OUTLETS, outlet_config, output_files
+from .runner import cli, run_outlet
+from .scheduler import crawl_all
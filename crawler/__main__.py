@@ -0,0 +1,4 @@
+from .runner import cli
+
+# python -m crawler <Medium> [--debug] [--log datei]
+cli()
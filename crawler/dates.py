@@ -0,0 +1,63 @@
+import re
+from urllib.parse import urlparse
+
+URL_DATE_PATTERNS = [
+    re.compile(r"/(19\d{2}|20\d{2})/(\d{2})/"),
+    re.compile(r"(19\d{2}|20\d{2})(\d{2})(\d{2})"),
+]
+
+
+def year_month_from_lastmod(lastmod: str):
+    if not lastmod or len(lastmod) < 7:
+        return None, None
+    try:
+        return int(lastmod[:4]), int(lastmod[5:7])
+    except ValueError:
+        return None, None
+
+
+def year_month_from_url(url: str):
+    for pattern in URL_DATE_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return int(m.group(1)), int(m.group(2))
+    return None, None
+
+
+def year_from_path(url: str):
+    # erstes Pfadsegment mit vier Ziffern, z.B. /sport/fussball/2024/...
+    for part in urlparse(url).path.split("/"):
+        if part.isdigit() and len(part) == 4:
+            y = int(part)
+            if 1900 < y < 2100:
+                return y, None
+    return None, None
+
+
+def sitemap_date(url: str, pattern):
+    """(Jahr, Monat) aus dem Sitemap-Namen; pattern hat die Gruppen Jahr und (optional) Monat."""
+    if pattern is None:
+        return None, None
+    m = pattern.search(url)
+    if not m:
+        return None, None
+    month = m.group(2) if m.re.groups >= 2 else None
+    return int(m.group(1)), int(month) if month else None
+
+
+def row_date(sources, loc: str, lastmod: str, sm_date):
+    """Erste Quelle (lastmod, url, path, sitemap), die ein Jahr liefert."""
+    for source in sources:
+        if source == "lastmod":
+            y, m = year_month_from_lastmod(lastmod)
+        elif source == "url":
+            y, m = year_month_from_url(loc)
+        elif source == "path":
+            y, m = year_from_path(loc)
+        elif source == "sitemap":
+            y, m = sm_date
+        else:
+            raise ValueError(f"Unbekannte Datumsquelle: {source}")
+        if y is not None:
+            return y, m
+    return None, None
@@ -0,0 +1,269 @@
+import re
+import xml.etree.ElementTree as ET
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+
+from http_cache import has_frozen
+from http_client import decompress, decompress_head, fetch, fetch_exists, fetch_text
+from rate_limit import apply_crawl_delay, limiter_for
+from sitemap_parser import CHUNK_SIZE, parse_sitemap
+
+from .dates import sitemap_date, year_month_from_lastmod
+
+
+def in_years(config: dict, year) -> bool:
+    if config["shards"]:
+        # Luecken zwischen den Bereichen gar nicht erst laden
+        return any(start <= year <= end for start, end in config["shards"])
+    return config["start_year"] <= year <= config["end_year"]
+
+
+def child_year(config: dict, loc: str, lastmod: str):
+    y, _ = sitemap_date(loc, config["sitemap_date"])
+    if y is None and config["sitemap_lastmod"] and lastmod:
+        y, _ = year_month_from_lastmod(lastmod)
+    return y
+
+
+def wanted_child(config: dict, loc: str, lastmod: str) -> bool:
+    if config["child_filter"] and config["child_filter"] not in loc:
+        return False
+    y = child_year(config, loc, lastmod)
+    if y is None:
+        return config["keep_undated"]
+    return in_years(config, y)
+
+
+def iter_index(config: dict):
+    """Kind-Sitemaps aus dem Sitemap-Index als (loc, lastmod), gefiltert nach Jahr."""
+    root = config["sitemap"]
+    typ, items = parse_sitemap(fetch(root))
+    if typ == "urlset" and config["root_may_be_urlset"]:
+        yield root, ""
+        return
+    if typ != "index":
+        raise RuntimeError("Root sitemap is not an index.")
+    count = 0
+    for loc, lastmod in items:
+        if not wanted_child(config, loc, lastmod):
+            continue
+        yield loc, lastmod
+        count += 1
+        if config["max_sitemaps"] is not None and count >= config["max_sitemaps"]:
+            break
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{year}-{month:02d}"
+
+
+def month_grid(config: dict) -> list:
+    """(Jahr, Monat) im Jahresbereich bis zum aktuellen Monat, begrenzt auf "month_range"."""
+    today = date.today()
+    first, last = config["month_range"] or ("", "9999-99")
+    return [
+        (year, month)
+        for year in range(config["start_year"], config["end_year"] + 1)
+        for month in range(1, 13)
+        if in_years(config, year) and (year, month) <= (today.year, today.month)
+        and first <= month_key(year, month) <= last
+    ]
+
+
+def month_available(config: dict, year: int, month: int) -> bool:
+    url = config["template"].format(year=year, month=month)
+    if not has_frozen(url):
+        limiter_for(url, config["requests_per_second"]).acquire()
+    return fetch_exists(url)
+
+
+def probe_months(config: dict, known: dict = None) -> dict:
+    """
+    Erster und letzter Monat im Jahresbereich, fuer den es eine Sitemap
+    gibt (vorne und hinten 404/410). Gesucht wird Monat fuer Monat, weil das
+    Archiv Luecken haben kann. known ist das Ergebnis des letzten Laufs:
+    Monate vor dessen "first" fehlten damals schon und werden nicht mehr
+    gefragt, der letzte Monat wird jedes Mal neu gesucht (meist ein Request,
+    der Body bleibt im Cache fuer den Crawl). Gibt {"first", "last",
+    "probed_from"} als "YYYY-MM" zurueck, {} wenn kein Monat da ist.
+    """
+    grid = month_grid(dict(config, month_range=None))
+    if not grid:
+        return {}
+    probed_from = month_key(*grid[0])
+    start = 0
+    if known and known.get("first") and known.get("probed_from", "9999-99") <= probed_from:
+        probed_from = known["probed_from"]
+        start = next((i for i, ym in enumerate(grid) if month_key(*ym) >= known["first"]), len(grid))
+    first = next((i for i in range(start, len(grid)) if month_available(config, *grid[i])), None)
+    if first is None:
+        return {}
+    last = next(i for i in range(len(grid) - 1, first - 1, -1)
+                if i == first or month_available(config, *grid[i]))
+    return {"first": month_key(*grid[first]), "last": month_key(*grid[last]), "probed_from": probed_from}
+
+
+def template_urls(config: dict) -> list:
+    """URLs aus config["template"] fuer month_grid(); mit {day} eine pro Tag bis heute."""
+    template = config["template"]
+    if "{day" not in template:
+        return [template.format(year=year, month=month) for year, month in month_grid(config)]
+    today = date.today()
+    return [
+        template.format(year=year, month=month, day=day)
+        for year, month in month_grid(config)
+        for day in range(1, monthrange(year, month)[1] + 1)
+        if date(year, month, day) <= today
+    ]
+
+
+def learn_template(config: dict, child_urls) -> str:
+    """
+    Template aus einer bekannten Kind-Sitemap (z.B. aus dem Manifest des
+    letzten Laufs): Jahr und Monat aus "sitemap_date" werden Platzhalter,
+    ein Tag direkt dahinter ("2024-05-02.xml") ebenfalls. "" wenn keine
+    URL passt.
+    """
+    pattern = config["sitemap_date"]
+    if pattern is None:
+        return ""
+    for url in sorted(child_urls, reverse=True):
+        m = pattern.search(url)
+        if m is None or m.re.groups < 2 or not m.group(2):
+            continue
+        day = re.match(r"([-_])\d{2}(?!\d)", url[m.end(2):])
+        parts = [url[:m.start(1)], url[m.end(1):m.start(2)], url[m.end(2) + (day.end() if day else 0):]]
+        parts = [p.replace("{", "{{").replace("}", "}}") for p in parts]
+        return parts[0] + "{year}" + parts[1] + "{month:02d}" + (day.group(1) + "{day:02d}" if day else "") + parts[2]
+    return ""
+
+
+def iter_template(config: dict):
+    """Monats-Sitemaps direkt aus dem URL-Template (kein Index noetig)."""
+    for url in template_urls(config):
+        yield url, ""
+
+
+def iter_predicted(config: dict, known=(), on_total=None, lastmods: dict = None):
+    """
+    Kind-Sitemaps aus dem Template, ohne auf den Index zu warten: der Index
+    laedt nebenher, bis dahin gehen die Kandidaten (aelteste zuerst) mit
+    lastmod None direkt raus. Danach die uebrigen Kinder aus dem Index in
+    dessen Reihenfolge, Kandidaten ohne Eintrag im Index nicht mehr. Bei
+    einem chronologischen Index ist das dieselbe Reihenfolge wie bei
+    iter_index, egal wie frueh der Index da ist (die CSV bleibt von Lauf zu
+    Lauf gleich). Ohne Template ist das iter_index (jede Sitemap aber nur
+    einmal).
+
+    known sind die Kind-Sitemaps des letzten Laufs: dann sind Kandidaten nur
+    diese und alle ab deren neuestem Monat, Luecken im Archiv kosten so
+    keine Requests. on_total(urls) bekommt alle Sitemaps des Laufs, sobald
+    der Index da ist; in lastmods traegt er dann das lastmod der schon
+    geschickten Kandidaten nach (fehlen sie im Index, bleibt es None).
+    """
+    candidates = [url for url in template_urls(config) if wanted_child(config, url, "")] \
+        if config["template"] else []
+    dates = [sitemap_date(url, config["sitemap_date"]) for url in known]
+    newest = max((d for d in dates if d[0] is not None and d[1] is not None), default=None)
+    if newest is not None:
+        candidates = [url for url in candidates
+                      if url in known or sitemap_date(url, config["sitemap_date"]) >= newest]
+    max_sitemaps = config["max_sitemaps"]
+    sent = set()
+    with ThreadPoolExecutor(1) as pool:
+        index = pool.submit(lambda: dict(iter_index(dict(config, max_sitemaps=None))))
+        pos = 0
+        limit = len(candidates) if max_sitemaps is None else min(len(candidates), max_sitemaps)
+        while pos < limit and not index.done():
+            sent.add(candidates[pos])
+            yield candidates[pos], None
+            pos += 1
+        try:
+            children = index.result()
+        except Exception as e:
+            # ohne Index bleiben die Kandidaten ungeprueft
+            print(f"[WARN] Index nicht geladen, nur Template: {config['sitemap']} -> {e}")
+            children = dict.fromkeys(candidates, "")
+        if lastmods is not None:
+            for loc in sent:
+                if loc in children:
+                    lastmods[loc] = children[loc]
+        rest = [loc for loc in children if loc not in sent]
+        if max_sitemaps is not None:
+            rest = rest[:max(0, max_sitemaps - len(sent))]
+        if on_total is not None:
+            on_total([*sent, *rest])
+        for loc in rest:
+            yield loc, children[loc]
+
+
+def sitemaps_from_robots(robots_url: str) -> list[str]:
+    robots_txt = fetch_text(robots_url)
+    apply_crawl_delay(robots_url, robots_txt)
+    sitemaps = []
+    for line in robots_txt.splitlines():
+        line = line.strip()
+        if line.lower().startswith("sitemap:"):
+            sitemaps.append(line.split(":", 1)[1].strip())
+    return sitemaps
+
+
+def choose_root(sitemaps: list[str], preferred: str = "") -> str:
+    if preferred:
+        for sm in sitemaps:
+            if sm.rstrip("/") == preferred.rstrip("/"):
+                return sm
+    for sm in sitemaps:
+        if sm.rstrip("/").endswith("/sitemap.xml") and "/sitemaps/videos/" not in sm:
+            return sm
+    return sitemaps[0] if sitemaps else ""
+
+
+def robots_root(config: dict) -> str:
+    sitemaps = sitemaps_from_robots(config["robots"])
+    if not sitemaps:
+        raise RuntimeError("Keine Sitemap im robots.txt gefunden.")
+    return choose_root(sitemaps, config["sitemap"])
+
+
+def index_children(config: dict, sm_url: str, body: bytes):
+    """
+    Fuer einen Sitemap-Index die gewuenschten Kinder (wanted_child, also vor
+    dem Einreihen nach Jahr gefiltert), fuer alles andere None. Der Typ kommt
+    aus dem Anfang der Sitemap, ganz entpackt und geparst wird nur ein Index.
+    """
+    try:
+        typ, _ = parse_sitemap(decompress_head(body, CHUNK_SIZE))
+    except ET.ParseError:
+        # Wurzel-Element nicht im ersten Stueck: ganz parsen
+        typ = "index"
+    if typ != "index":
+        return None
+    typ, items = parse_sitemap(decompress(body))
+    if typ != "index":
+        return None
+    return [loc for loc, lastmod in items if wanted_child(config, loc, lastmod)]
+
+
+STRATEGIES = {
+    "index": iter_index,
+    "template": iter_template,
+    "predict": iter_predicted,
+}
+
+
+def iter_sitemaps(config: dict, lastmods: dict = None, known=(), on_total=None):
+    """
+    URLs der Kind-Sitemaps; lastmods bekommt dabei das lastmod aus dem Index
+    (None: noch nicht bestaetigter Kandidat). known, on_total: siehe
+    iter_predicted (nur fuer "predict").
+    """
+    strategy = STRATEGIES[config["discovery"]]
+    if strategy is iter_predicted:
+        strategy = partial(iter_predicted, known=known, on_total=on_total, lastmods=lastmods)
+    for loc, lastmod in strategy(config):
+        if lastmods is not None:
+            lastmods[loc] = lastmod
+        yield loc
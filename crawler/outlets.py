@@ -0,0 +1,185 @@
+import re
+
+from csv_sink import URL_FIELDS
+
+YEAR = r"(19\d{2}|20\d{2})"
+
+# Standardwerte, jedes Medium ueberschreibt nur, was bei ihm anders ist
+DEFAULTS = {
+    "start_year": 2005,
+    "end_year": 2025,
+    # "index": Sitemap-Index laden, "template": Monats-Sitemaps aus "template",
+    # "predict": Kandidaten aus "template" (sonst aus dem Manifest gelernt) sofort
+    # laden, der Index kommt nebenher und bestaetigt nur,
+    # "robots": Root-Sitemap aus robots.txt und verschachtelte Indizes ablaufen
+    "discovery": "index",
+    "sitemap": "",
+    "template": "",
+    "robots": "",
+    # Datum einer Kind-Sitemap aus ihrem Namen (Gruppen: Jahr, Monat)
+    "sitemap_date": None,
+    "sitemap_lastmod": True,    # sonst lastmod aus dem Index
+    "keep_undated": False,      # Kind-Sitemaps ohne Datum trotzdem laden
+    "root_may_be_urlset": False,
+    # "template": ersten/letzten vorhandenen Monat suchen (bzw. aus dem Manifest)
+    # und nur dazwischen laden; month_range ("YYYY-MM", "YYYY-MM") setzt das fest
+    "probe_months": False,
+    "month_range": None,
+    "child_filter": "",         # nur Kind-Sitemaps, deren URL das enthaelt
+    "path_prefix": "",          # nur Artikel-URLs mit diesem Anfang
+    "prefilter": True,          # Urlsets ohne Kandidaten in den Bytes nicht parsen
+    # mit Manifest vom letzten Lauf nur Kind-Sitemaps mit neuem lastmod laden
+    "delta": False,
+    # Reihenfolge der Quellen fuer Jahr/Monat eines Artikels
+    "row_date": ("lastmod", "url"),
+    # wie REQUEST_DELAY = 0.2 in den alten Skripten; schneller nur ueber parallele Requests
+    "requests_per_second": 5.0,
+    "max_concurrency": 4,
+    # Parsen/Klassifizieren: Threads oder (grosse Urlsets) eigene Prozesse;
+    # parse_workers None = Anzahl Kerne
+    "process_pool": False,
+    "parse_workers": None,
+    "process_min_bytes": 256 * 1024,    # kleinere Urlsets trotzdem im Thread
+    "max_sitemaps": 20000,
+    "max_urls": None,
+    # Jahresbereiche [(start, end), ...]: ein Crawl, eine CSV pro Bereich und
+    # eine gemeinsame; start_year/end_year umfassen dann alle Bereiche
+    "shards": None,
+    "fields": URL_FIELDS,
+    "file_pattern": "{prefix}_fussball_{kind}_{start}_{end}.csv",
+    "debug": False,
+}
+
+OUTLETS = {
+    "20min": {
+        "discovery": "predict",
+        "sitemap": "https://www.20min.ch/sitemaps/de/articles.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}-(\d{{2}})-\d{{2}}\.xml"),
+        "row_date": ("lastmod", "url", "sitemap"),
+        "delta": True,
+        "file_prefix": "20min",
+    },
+    "Watson": {
+        "discovery": "predict",
+        "sitemap": "https://www.watson.ch/sitemap.xml",
+        "sitemap_date": re.compile(r"[?&]date=(\d{4})(\d{2})(?:&|$)"),
+        "row_date": ("lastmod", "sitemap"),
+        "delta": True,
+        "file_prefix": "watson",
+    },
+    "LeMonde": {
+        "sitemap": "https://www.lemonde.fr/sitemap_index.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}-(\d{{2}})-\d{{2}}\.xml"),
+        "keep_undated": True,
+        # REQUEST_DELAY = 0.8 in den alten Skripten
+        "requests_per_second": 1.25,
+        "max_concurrency": 2,
+        "process_pool": True,
+        "file_prefix": "lemonde",
+    },
+    "LeFigaro": {
+        "sitemap": "https://sitemaps.lefigaro.fr/lefigaro.fr/articles.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}-(\d{{2}})-\d{{2}}\.xml"),
+        "file_prefix": "lefigaro",
+    },
+    "Reppubblica": {
+        "sitemap": "https://www.repubblica.it/sitemap.xml",
+        "sitemap_date": re.compile(rf"sitemap-{YEAR}-(\d{{2}})\.xml"),
+        # REQUEST_DELAY = 0.8 in den alten Skripten
+        "requests_per_second": 1.25,
+        "max_concurrency": 2,
+        "max_sitemaps": 2000,
+        "process_pool": True,
+        "file_prefix": "repubblica",
+    },
+    "aftonbladet": {
+        "discovery": "predict",
+        "sitemap": "https://www.aftonbladet.se/sitemap.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}-(\d{{2}})-[^/]*\.xml"),
+        "sitemap_lastmod": False,
+        "keep_undated": True,
+        "root_may_be_urlset": True,
+        "row_date": ("lastmod", "url", "sitemap"),
+        "delta": True,
+        "file_prefix": "aftonbladet",
+    },
+    "jyllands-posten": {
+        "discovery": "predict",
+        "sitemap": "https://jyllands-posten.dk/sitemapindex.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}-(\d{{2}})-[^/]*\.xml"),
+        "sitemap_lastmod": False,
+        "keep_undated": True,
+        "root_may_be_urlset": True,
+        "row_date": ("lastmod", "url", "sitemap"),
+        "file_prefix": "jyllands-posten",
+    },
+    "SRF": {
+        "discovery": "template",
+        "template": "https://www.srf.ch/sitemaps/aron/articles/{year}_{month:02d}.xml",
+        "sitemap_date": re.compile(rf"/{YEAR}_(\d{{2}})\.xml"),
+        "path_prefix": "https://www.srf.ch/sport/fussball/",
+        "row_date": ("sitemap",),
+        # das Archiv beginnt nicht im Januar 2005
+        "probe_months": True,
+        "requests_per_second": 1.25,
+        "max_concurrency": 4,
+        "file_prefix": "srf",
+    },
+    "Spiegel": {
+        "discovery": "robots",
+        "robots": "https://www.spiegel.de/robots.txt",
+        # bevorzugte Root-Sitemap (nicht Video/Plus/News)
+        "sitemap": "https://www.spiegel.de/sitemap.xml",
+        # nur Artikel-Sitemaps (Video-Sitemaps haben ungueltiges XML)
+        "child_filter": "/sitemaps/article/",
+        "sitemap_date": re.compile(r"/sitemap-(\d{4})(?:-(\d{2}))?[^/]*$"),
+        "keep_undated": True,
+        "row_date": ("lastmod", "path", "sitemap"),
+        # frueher zwei Skripte (2017-2024 und 2025-2026), jetzt ein Lauf ueber den Index-Baum
+        "shards": ((2017, 2024), (2025, 2026)),
+        "requests_per_second": 1.25,
+        # zwei offene Requests, damit grosse .gz-Sitemaps das Rate-Limit nicht ausbremsen
+        "max_concurrency": 2,
+        "max_sitemaps": None,
+        "process_pool": True,
+        "fields": ["year", "lastmod", "category", "url"],
+        "file_prefix": "spiegel",
+        "debug": True,
+    },
+}
+
+
+def _shard_years(config: dict) -> tuple:
+    if not config["shards"]:
+        return config["start_year"], config["end_year"]
+    return min(start for start, _end in config["shards"]), max(end for _start, end in config["shards"])
+
+
+def outlet_config(outlet: str, **overrides) -> dict:
+    if outlet not in OUTLETS:
+        raise KeyError(f"Unbekanntes Medium: {outlet} (bekannt: {', '.join(OUTLETS)})")
+    config = dict(DEFAULTS)
+    config.update(OUTLETS[outlet])
+    config.setdefault("rules", outlet)
+    config.update(overrides)
+    if overrides.keys() & {"start_year", "end_year"} and "shards" not in overrides:
+        # explizite Jahre ersetzen die Bereiche aus OUTLETS (fehlt eines, gilt deren Rand)
+        config["start_year"] = overrides.get("start_year", _shard_years(config)[0])
+        config["end_year"] = overrides.get("end_year", _shard_years(config)[1])
+        config["shards"] = None
+    if config["shards"]:
+        config["shards"] = sorted(tuple(shard) for shard in config["shards"])
+        config["start_year"], config["end_year"] = _shard_years(config)
+    config["name"] = outlet
+    return config
+
+
+def shard_configs(config: dict) -> list:
+    """Eine Config pro Jahresbereich (fuer die Dateinamen), leer ohne "shards"."""
+    return [dict(config, start_year=start, end_year=end, shards=None) for start, end in config["shards"] or ()]
+
+
+def output_files(config: dict) -> tuple:
+    names = {"prefix": config["file_prefix"], "start": config["start_year"], "end": config["end_year"]}
+    pattern = config["file_pattern"]
+    return pattern.format(kind="urls", **names), pattern.format(kind="counts", **names)
@@ -0,0 +1,144 @@
+import re
+
+from sitemap_parser import parse_sitemap
+
+# wie TOKEN_RE auf url.lower(): A-Z klein, alles ausser [a-z0-9] wird Trenner
+_TOKEN_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if 48 <= c <= 57 or 97 <= c <= 122 else 32
+    for c in range(256)
+)
+# ohne Ziffern gibt es weniger Tokens; Trenner koennen nur zusaetzliche Treffer erzeugen
+_LETTER_TABLE = bytes(c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 else 32 for c in range(256))
+_LOWER_TABLE = bytes(c + 32 if 65 <= c <= 90 else c for c in range(256))
+# hier ergeben Bytes und geparste URL nicht dieselben Tokens: die zwei Zeichen,
+# deren lower() ASCII liefert (İ, Kelvin-K), Zeichenreferenzen und UTF-16
+_UNSAFE_UTF8 = (b"\xc4\xb0", b"\xe2\x84\xaa")
+ITEM_OPEN = b"<url"
+ITEM_CLOSE = b"</url>"
+# liegen mehr Bytes in Kandidaten, ist ein normaler Parse billiger
+MAX_CANDIDATE_SHARE = 0.5
+
+
+def count_items(body: bytes) -> int:
+    return body.count(ITEM_CLOSE)
+
+
+def _unsafe(body: bytes) -> bool:
+    if b"&#" in body or b"\x00" in body[:4]:
+        return True
+    return not body.isascii() and any(seq in body for seq in _UNSAFE_UTF8)
+
+
+def _tokens(body: bytes, table: bytes) -> set:
+    return set(body.translate(table).decode("ascii").split())
+
+
+def _positions(lower: bytes, words) -> list:
+    # Stellen, an denen eines der Woerter als ganzes Token steht
+    positions = []
+    for word in words:
+        word = word.encode("ascii")
+        pos = lower.find(word)
+        while pos >= 0:
+            after = pos + len(word)
+            if not lower[pos - 1:pos].isalnum() and not lower[after:after + 1].isalnum():
+                positions.append(pos)
+            pos = lower.find(word, after)
+    return sorted(positions)
+
+
+def _item_start(body: bytes, lo: int, pos: int) -> int:
+    # letztes "<url>" / "<url ..." vor pos ("<urlset" ist der Kopf)
+    start = body.rfind(ITEM_OPEN, lo, pos)
+    while start >= 0 and body[start + 4:start + 5] not in (b">", b" ", b"\n", b"\r", b"\t"):
+        start = body.rfind(ITEM_OPEN, lo, start)
+    return start
+
+
+def _regions(body: bytes, positions):
+    """<url>-Elemente um die Trefferpositionen, None wenn normal geparst werden soll."""
+    regions = []
+    size = 0
+    end = 0
+    for pos in positions:
+        if pos < end:
+            continue
+        start = _item_start(body, end, pos)
+        if start < 0:
+            if not regions:
+                # Treffer im Kopf (Kommentar) oder Elemente mit Prefix (<s:url>):
+                # keinem <url> zuzuordnen, also normal parsen
+                return None
+            # Treffer zwischen zwei Elementen: ab dem Ende des letzten Bereichs
+            start = end
+        close = body.find(ITEM_CLOSE, pos)
+        if close < 0:
+            # abgeschnittene Sitemap: der Parser soll den Fehler melden wie sonst
+            return None
+        end = close + len(ITEM_CLOSE)
+        regions.append(body[start:end])
+        size += end - start
+        if size > MAX_CANDIDATE_SHARE * len(body):
+            return None
+    return regions
+
+
+def candidates(body: bytes, config: dict, classifier):
+    """
+    Sucht die Kandidaten eines Urlsets direkt in den Bytes: Pfad (path_prefix
+    der Config, require_path der Regeln) und mindestens ein Token aus
+    classifier.triggers. Gibt die <url>-Elemente mit moeglichem Treffer
+    zurueck (leer: nichts zu parsen) oder None, wenn normal geparst werden
+    soll (Vorfilter nicht sicher oder zu viele Kandidaten).
+    """
+    if _unsafe(body):
+        return None
+    paths = [p.encode("utf-8") for p in (config["path_prefix"], classifier.require_path) if p]
+    for path in paths:
+        if path not in body:
+            return []
+
+    triggers = classifier.triggers
+    table = _TOKEN_TABLE if any(not t.isalpha() for t in triggers) else _LETTER_TABLE
+    hits = triggers.intersection(_tokens(body, table))
+    # decode und fold aendern nur %-Sequenzen und Nicht-ASCII, sonst ist es url.lower()
+    normalizer = classifier.normalizer
+    folded = (normalizer.decode and b"%" in body) or (normalizer.fold and not body.isascii())
+    if not hits and folded:
+        # Tokens wie beim Klassifizieren: %-Sequenzen entpackt, Umlaute ersetzt
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        hits = triggers.intersection(normalizer.tokens(text))
+    if not hits:
+        return []
+    if not count_items(body):
+        # Treffer, aber kein </url>: Namespace-Prefix (<s:url>) o.ae., normal parsen
+        return None
+
+    if paths:
+        # jede passende URL enthaelt den Pfad
+        positions = (m.start() for m in re.finditer(re.escape(paths[-1]), body))
+    elif folded:
+        # Treffer nach fold lassen sich nicht auf Stellen im Original zurueckfuehren
+        return None
+    else:
+        positions = _positions(body.translate(_LOWER_TABLE), hits)
+    return _regions(body, positions)
+
+
+def prefiltered_entries(body: bytes, config: dict, classifier):
+    """
+    Wie parse_sitemap(body)[1] fuer ein Urlset, aber geparst werden nur die
+    Kandidaten aus candidates(). None, wenn normal geparst werden muss.
+    """
+    regions = candidates(body, config, classifier)
+    if regions is None:
+        return None
+    if not regions:
+        return iter(())
+    head = body[:_item_start(body, 0, body.find(ITEM_CLOSE))]
+    tail = body[body.rfind(ITEM_CLOSE) + len(ITEM_CLOSE):]
+    _typ, entries = parse_sitemap(head + b"".join(regions) + tail)
+    return entries
@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from checkpoint import CheckpointJournal, journal_path
+from classify_rules import classifier_for
+from crawl_engine import Pipeline, new_counters
+from csv_sink import URL_FIELDS, CsvSink, count_rows, merge_rows, split_by_year
+from http_cache import stored_etag
+from http_client import decompress, fetch_changed
+from manifest import CrawlManifest, manifest_path
+from sitemap_parser import parse_sitemap
+
+from .dates import row_date, sitemap_date
+from .discovery import in_years, index_children, iter_sitemaps, learn_template, probe_months, robots_root
+from .outlets import OUTLETS, outlet_config, output_files, shard_configs
+from .prefilter import count_items, prefiltered_entries
+
+STATUS_EVERY_SECONDS = 1.0
+MAX_DEBUG_URLS = 5
+
+
+def new_stats() -> dict:
+    return {
+        "sitemaps": 0,
+        "entries": 0,
+        "matches": 0,
+        "year_filtered": 0,
+        "samples": [],
+        "lock": threading.Lock(),
+    }
+
+
+def expand_rows(rows) -> list:
+    return [dict(zip(URL_FIELDS, row)) for row in rows]
+
+
+def filter_urlset(config: dict, classifier, sm_url: str, typ: str, entries):
+    """
+    Filtert ein Urlset: Pfad-Prefix, Regeln des Mediums, Jahr. Gibt (rows, info),
+    rows kompakt als Tupel in der Reihenfolge von URL_FIELDS (siehe expand_rows).
+    """
+    if typ != "urlset":
+        return [], None
+
+    rows = []
+    seen = matches = year_filtered = 0
+    prefix = config["path_prefix"]
+    sources = config["row_date"]
+    sm_date = sitemap_date(sm_url, config["sitemap_date"])
+    try:
+        for loc, lastmod in entries:
+            seen += 1
+            if prefix and not loc.startswith(prefix):
+                continue
+            category = classifier.match_and_classify(loc)
+            if category is None:
+                continue
+            matches += 1
+
+            y, m = row_date(sources, loc, lastmod, sm_date)
+            if y is None or not in_years(config, y):
+                year_filtered += 1
+                continue
+
+            rows.append((y, m or "", lastmod, category, loc))
+    except ET.ParseError as e:
+        # Parser streamt: bereits gefundene Zeilen bleiben erhalten
+        print(f"[WARN] Sitemap parse failed: {sm_url} -> {e}")
+    return rows, {"entries": seen, "matches": matches, "year_filtered": year_filtered}
+
+
+def merge_stats(stats: dict, sm_url: str, rows: list, info: dict):
+    if info is None:
+        return
+    with stats["lock"]:
+        stats["sitemaps"] += 1
+        stats["entries"] += info["entries"]
+        stats["matches"] += info["matches"]
+        stats["year_filtered"] += info["year_filtered"]
+        free = MAX_DEBUG_URLS - len(stats["samples"])
+        if free > 0:
+            stats["samples"].extend(r["url"] for r in rows[:free])
+
+
+def process_sitemap(config: dict, sm_url: str, body: bytes):
+    """
+    Parse-Stufe der Pipeline: entpacken, parsen, filtern, klassifizieren.
+    Nur Config und Bytes als Argumente, damit es auch in einem eigenen
+    Prozess laeuft; zurueck gehen nur die kompakten Treffer.
+    """
+    body = decompress(body)
+    classifier = classifier_for(config["rules"])
+    typ, entries = parse_sitemap(body)
+    candidates = None
+    if typ == "urlset" and config["prefilter"]:
+        # nur die <url>-Elemente parsen, in denen ein Treffer stehen kann
+        candidates = prefiltered_entries(body, config, classifier)
+    rows, info = filter_urlset(config, classifier, sm_url, typ, entries if candidates is None else candidates)
+    if candidates is not None:
+        info["entries"] = count_items(body)
+    return rows, info["entries"] if info else 0, info
+
+
+def fetch_delta(manifest: CrawlManifest, etags: dict, sm_url: str):
+    # laeuft im Fetch-Thread der Pipeline; None = unveraendert (304)
+    body, etags[sm_url] = fetch_changed(sm_url, manifest.etag(sm_url))
+    return body
+
+
+def parse_workers(config: dict) -> int:
+    return config["parse_workers"] or os.cpu_count() or 1
+
+
+def parse_executor(config: dict):
+    """Prozesse fuer grosse Urlsets (Config "process_pool"), sonst None (Threads der Pipeline)."""
+    if not config["process_pool"]:
+        return None
+    # spawn: kein fork aus einem Prozess, in dem schon Fetch-Threads laufen
+    return ProcessPoolExecutor(parse_workers(config), mp_context=multiprocessing.get_context("spawn"))
+
+
+def output_paths(config: dict, out_dir: str = None) -> tuple:
+    urls_csv, counts_csv = output_files(config)
+    if out_dir:
+        urls_csv = os.path.join(out_dir, urls_csv)
+        counts_csv = os.path.join(out_dir, counts_csv)
+    return urls_csv, counts_csv
+
+
+def write_shards(config: dict, urls_csv: str, out_dir: str = None) -> list:
+    """Teilt die gemeinsame URL-CSV auf die Jahresbereiche (Config "shards") auf."""
+    targets = []
+    for shard in shard_configs(config):
+        shard_urls, shard_counts = output_paths(shard, out_dir)
+        if shard_urls != urls_csv:
+            # ein Bereich ueber alle Jahre ist schon die gemeinsame CSV
+            targets.append((shard["start_year"], shard["end_year"], shard_urls, shard_counts))
+    rows = split_by_year(urls_csv, targets, config["fields"])
+    return [
+        {"start_year": start, "end_year": end, "urls_csv": shard_urls, "counts_csv": shard_counts, "rows": n}
+        for (start, end, shard_urls, shard_counts), n in zip(targets, rows)
+    ]
+
+
+def run_outlet(outlet: str, out_dir: str = None, status: bool = True, **overrides):
+    """
+    Crawlt ein Medium nach seiner Konfiguration in outlets.OUTLETS und
+    schreibt URL- und Counts-CSV (nach out_dir, sonst ins aktuelle
+    Verzeichnis). Mit "shards" wird der Index nur einmal abgelaufen und
+    die gemeinsame CSV danach pro Jahresbereich aufgeteilt. Gibt eine
+    Zusammenfassung zurueck, None bei Fehler.
+    """
+    config = outlet_config(outlet, **overrides)
+    urls_csv, counts_csv = output_paths(config, out_dir)
+
+    root = None
+    if config["discovery"] == "robots":
+        try:
+            root = robots_root(config)
+        except Exception as e:
+            print("[ERROR] Konnte Sitemaps nicht ermitteln:", e)
+            return None
+        if config["debug"]:
+            print("[INFO] Root sitemap:", root)
+
+    stats = new_stats()
+    counters = new_counters()
+    started = time.time()
+
+    # nach einem Abbruch: fertige Sitemaps ueberspringen und die CSV fortsetzen
+    journal = CheckpointJournal(journal_path(urls_csv))
+    # abgebrochener Lauf: auch mit verworfenem Journal kein Delta auf eine unvollstaendige CSV
+    interrupted = journal.resumed
+    if journal.resumed:
+        rows_on_disk = count_rows(urls_csv)
+        if rows_on_disk < journal.rows:
+            # sonst fehlten die Zeilen der Sitemaps, die das Journal als fertig fuehrt
+            print(f"[WARN] {outlet}: URL-CSV hat {rows_on_disk} statt {journal.rows} Zeilen (fehlt oder "
+                  f"abgeschnitten), Journal verworfen, voller Lauf")
+            journal.reset()
+        else:
+            print(f"[INFO] {outlet}: Fortsetzen, {len(journal.done)} Sitemaps fertig, {journal.rows} Zeilen")
+    keep_rows = journal.rows if journal.resumed else None
+
+    # Manifest nur fuer Index/Template: bei robots gibt es kein lastmod pro Kind
+    manifest = CrawlManifest(manifest_path(urls_csv)) if root is None else None
+    delta = bool(config["delta"] and manifest is not None and manifest.sitemaps and not interrupted
+                 and os.path.exists(urls_csv))
+    if config["probe_months"] and config["month_range"] is None and manifest is not None:
+        # Monate vor dem Archiv (und nach der letzten Sitemap) gar nicht erst anfragen
+        try:
+            months = probe_months(config, manifest.months)
+        except Exception as e:
+            print(f"[WARN] {outlet}: Monate nicht ermittelt, lade alle -> {e}")
+        else:
+            if months:
+                manifest.months = months
+                config = dict(config, month_range=(months["first"], months["last"]))
+                print(f"[INFO] {outlet}: Sitemaps von {months['first']} bis {months['last']}")
+    if config["discovery"] == "predict" and not config["template"] and manifest is not None:
+        # Kind-Sitemaps des letzten Laufs zeigen, wie die URLs gebaut sind
+        config = dict(config, template=learn_template(config, manifest.sitemaps))
+        if config["debug"] and config["template"]:
+            print("[INFO] Template:", config["template"])
+    lastmods = {}
+    etags = {}
+    rows_done = [0]
+    last_print = [0.0]
+    # stream ("predict"): die Gesamtzahl kennt erst die Discovery, sobald der Index da ist
+    planned = [None]
+    resumed = set(journal.done)
+
+    def on_total(urls: list):
+        planned[0] = sum(1 for u in urls if u not in resumed)
+
+    def progress(done: int, total: int):
+        now = time.time()
+        total = total or planned[0]
+        if status and total and (now - last_print[0] >= STATUS_EVERY_SECONDS or done == total):
+            end = "\n" if done == total else "\r"
+            print(f"Sitemaps: {done}/{total} | Matches: {stats['matches']} | Rows: {rows_done[0]}",
+                  end=end, flush=True)
+            last_print[0] = now
+
+    def on_result(sm_url: str, rows: list, info: dict):
+        merge_stats(stats, sm_url, rows, info)
+        rows_done[0] += len(rows)
+        if manifest is not None and info is not None:
+            etag = etags.get(sm_url) or stored_etag(sm_url)
+            manifest.update(sm_url, lastmods.get(sm_url) or "", etag, len(rows))
+
+    not_indexed = []
+
+    def expected_failure(sm_url: str, error: Exception) -> bool:
+        # "predict": Kandidat, den der Index nicht bestaetigt hat (fehlender Tag/Monat)
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status in (404, 410) and sm_url in lastmods and lastmods[sm_url] is None:
+            not_indexed.append(sm_url)
+            return True
+        return False
+
+    executor = parse_executor(config)
+    options = {
+        "executor": executor,
+        "parse_workers": parse_workers(config),
+        "progress": progress,
+        "on_result": on_result,
+        "counters": counters,
+        "raw": True,
+        "expand": expand_rows,
+        "inline_below": config["process_min_bytes"] if executor is not None else 0,
+        "expected_failure": expected_failure,
+    }
+    try:
+        if delta:
+            # nur Kind-Sitemaps, deren lastmod sich seit dem Manifest bewegt hat
+            # lastmod aller Kinder steht nur im Index
+            children = list(iter_sitemaps(dict(config, discovery="index"), lastmods))
+            changed = [u for u in children if not manifest.unchanged(u, lastmods[u])]
+            print(f"[INFO] {outlet}: Delta, {len(changed)} von {len(children)} Sitemaps geaendert")
+            pipeline = Pipeline(partial(process_sitemap, config), fetch=partial(fetch_delta, manifest, etags),
+                                **options)
+            new_rows = asyncio.run(pipeline.run(
+                changed,
+                requests_per_second=config["requests_per_second"],
+                max_concurrency=config["max_concurrency"],
+            ))
+            counter, added, replaced = merge_rows(urls_csv, counts_csv, new_rows, config["fields"])
+            print(f"[INFO] {outlet}: {added} neue Zeilen, {replaced} schon vorhanden")
+            counts = counter.rows()
+            total = sum(c["Total"] for c in counts)
+        else:
+            known = set(manifest.sitemaps) if manifest is not None else set()
+            if manifest is not None and not journal.resumed:
+                manifest.clear()
+            with CsvSink(urls_csv, counts_csv, fieldnames=config["fields"], keep_rows=keep_rows) as sink:
+                rows_done[0] = sink.rows
+                pipeline = Pipeline(partial(process_sitemap, config), sink=sink, journal=journal,
+                                    max_rows=config["max_urls"], **options)
+                if root is not None:
+                    # verschachtelte Indizes: Index-Baum ab der Root-Sitemap ablaufen
+                    asyncio.run(pipeline.run_tree(
+                        [root],
+                        partial(index_children, config),
+                        requests_per_second=config["requests_per_second"],
+                        max_concurrency=config["max_concurrency"],
+                        max_sitemaps=config["max_sitemaps"],
+                    ))
+                else:
+                    asyncio.run(pipeline.run(
+                        iter_sitemaps(config, lastmods, known=known, on_total=on_total),
+                        requests_per_second=config["requests_per_second"],
+                        max_concurrency=config["max_concurrency"],
+                        stream=config["discovery"] == "predict",
+                    ))
+            total = sink.rows
+            counts = sink.counter.rows()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    journal.finish()
+    if manifest is not None:
+        # "predict": vor dem Index geladene Kandidaten bekommen ihr lastmod erst danach
+        for sm_url, lastmod in lastmods.items():
+            if lastmod:
+                manifest.set_lastmod(sm_url, lastmod)
+        manifest.save()
+    shards = write_shards(config, urls_csv, out_dir) if config["shards"] else []
+
+    print("Fertig.")
+    print(f"Export: {urls_csv}")
+    print(f"Export: {counts_csv}")
+    for shard in shards:
+        print(f"Export: {shard['urls_csv']} ({shard['rows']} Zeilen)")
+        print(f"Export: {shard['counts_csv']}")
+    if config["debug"]:
+        print(f"[INFO] Sitemaps: {stats['sitemaps']}, Entries: {stats['entries']}")
+        print(f"[INFO] Football URLs: {stats['matches']}, In-range: {total}, "
+              f"Year filtered: {stats['year_filtered']}")
+        if not_indexed:
+            print(f"[INFO] Kandidaten ohne Sitemap (404): {len(not_indexed)}, z.B. {not_indexed[0]}")
+        if stats["samples"]:
+            print("[INFO] Sample URLs:")
+            for u in stats["samples"]:
+                print(" -", u)
+        for counter in counters.values():
+            print(f"[INFO] {counter}")
+
+    return {
+        "outlet": outlet,
+        "urls_csv": urls_csv,
+        "counts_csv": counts_csv,
+        "rows": total,
+        "counts": counts,
+        "delta": delta,
+        "shards": shards,
+        "sitemaps": stats["sitemaps"],
+        "entries": stats["entries"],
+        "matches": stats["matches"],
+        "stages": {name: c.as_dict() for name, c in counters.items()},
+        "seconds": time.time() - started,
+    }
+
+
+def setup_logging(log_path: str):
+    if not log_path:
+        return
+    log_file = open(log_path, "a", encoding="utf-8")
+    sys.stdout = log_file
+    sys.stderr = log_file
+
+
+def parse_shard(parser: argparse.ArgumentParser, text: str) -> tuple:
+    start, sep, end = text.partition("-")
+    if not (start.isdigit() and (not sep or end.isdigit())):
+        parser.error(f"--shard erwartet START-END, z.B. 2017-2024: {text}")
+    return int(start), int(end or start)
+
+
+def cli(outlet: str = None, argv=None, **overrides):
+    """Kommandozeile fuer ein Medium (die Crawler-Skripte rufen das mit ihrem Medium auf)."""
+    parser = argparse.ArgumentParser(
+        prog=None if outlet else "python -m crawler",
+        description=f"{outlet or 'Sitemap'} Crawler",
+    )
+    if outlet is None:
+        parser.add_argument("outlet", choices=sorted(OUTLETS), help="Medium")
+    parser.add_argument("--log", help="Pfad fuer Logfile (optional).", default="")
+    parser.add_argument("--debug", action="store_true", help="Debug-Ausgaben aktivieren.")
+    parser.add_argument("--start-year", type=int, help="erstes Jahr")
+    parser.add_argument("--end-year", type=int, help="letztes Jahr")
+    parser.add_argument("--shard", action="append", metavar="START-END",
+                        help="Jahresbereich mit eigener CSV (mehrfach moeglich, ersetzt die Bereiche der Config)")
+    parser.add_argument("--full", action="store_true", help="ganzer Crawl, auch wenn ein Delta moeglich waere")
+    parser.add_argument("--processes", type=int,
+                        help="Parsen/Klassifizieren in so vielen Prozessen (0: Threads)")
+    args = parser.parse_args(argv)
+    setup_logging(args.log)
+    if args.debug:
+        overrides["debug"] = True
+    if args.start_year is not None:
+        overrides["start_year"] = args.start_year
+    if args.end_year is not None:
+        overrides["end_year"] = args.end_year
+    if args.shard:
+        overrides["shards"] = [parse_shard(parser, shard) for shard in args.shard]
+    if args.full:
+        overrides["delta"] = False
+    if args.processes is not None:
+        overrides["process_pool"] = args.processes > 0
+        overrides["parse_workers"] = args.processes or None
+    return run_outlet(outlet or args.outlet, **overrides)
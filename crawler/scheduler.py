@@ -0,0 +1,95 @@
+import argparse
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .outlets import OUTLETS
+from .runner import run_outlet
+
+
+def _run_one(outlet: str, out_dir: str, overrides: dict):
+    # eigener Prozess pro Medium: Parsen/Klassifizieren laeuft auf allen Kernen,
+    # Rate-Limit und Crawl-delay bleiben pro Host (jedes Medium hat eigene Hosts)
+    try:
+        return run_outlet(outlet, out_dir=out_dir, status=False, **overrides)
+    except Exception as e:
+        traceback.print_exc()
+        return {"outlet": outlet, "error": f"{type(e).__name__}: {e}"}
+
+
+def crawl_all(outlets=None, out_dir: str = None, workers: int = None, **overrides) -> list:
+    """
+    Crawlt mehrere Medien gleichzeitig (Standard: alle aus OUTLETS) und
+    gibt die Zusammenfassungen von run_outlet in der Reihenfolge von
+    outlets zurueck.
+    """
+    outlets = list(outlets or OUTLETS)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or len(outlets)) as pool:
+        futures = {pool.submit(_run_one, o, out_dir, overrides): o for o in outlets}
+        for future in as_completed(futures):
+            outlet = futures[future]
+            result = future.result()
+            if result is None:
+                result = {"outlet": outlet, "error": "keine Sitemaps gefunden"}
+            results[outlet] = result
+            state = result.get("error") or f"{result['rows']} Zeilen in {result['seconds']:.0f}s"
+            print(f"[INFO] {outlet} fertig: {state}", flush=True)
+    return [results[o] for o in outlets]
+
+
+def print_summary(results: list, wall_seconds: float):
+    header = f"{'Medium':<16} {'Sitemaps':>8} {'Eintraege':>10} {'Zeilen':>8} {'Frauen':>7} {'Herren':>7} " \
+             f"{'Anteil':>7} {'Zeit':>7}"
+    print()
+    print(header)
+    print("-" * len(header))
+    total_rows = total_women = total_men = 0
+    outlet_seconds = 0.0
+    for r in results:
+        if "error" in r:
+            print(f"{r['outlet']:<16} FEHLER: {r['error']}")
+            continue
+        women = sum(c["Frauenfussball"] for c in r["counts"])
+        men = sum(c["Herrenfussball"] for c in r["counts"])
+        share = women / r["rows"] if r["rows"] else 0.0
+        total_rows += r["rows"]
+        total_women += women
+        total_men += men
+        outlet_seconds += r["seconds"]
+        print(f"{r['outlet']:<16} {r['sitemaps']:>8} {r['entries']:>10} {r['rows']:>8} {women:>7} {men:>7} "
+              f"{share:>7.4f} {r['seconds']:>6.0f}s")
+    print("-" * len(header))
+    share = total_women / total_rows if total_rows else 0.0
+    print(f"{'Total':<16} {'':>8} {'':>10} {total_rows:>8} {total_women:>7} {total_men:>7} {share:>7.4f}")
+    print(f"Laufzeit: {wall_seconds:.0f}s (seriell waeren es {outlet_seconds:.0f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="crawl_all.py",
+        description="Crawlt alle Medien parallel (ein Prozess pro Medium).",
+    )
+    parser.add_argument("outlets", nargs="*", metavar="MEDIUM",
+                        help=f"Standard: alle ({', '.join(OUTLETS)})")
+    parser.add_argument("--out-dir", default="", help="Zielordner fuer die CSVs (Standard: aktueller Ordner)")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: eines pro Medium)")
+    parser.add_argument("--start-year", type=int, help="erstes Jahr (fuer alle Medien)")
+    parser.add_argument("--end-year", type=int, help="letztes Jahr (fuer alle Medien)")
+    args = parser.parse_args(argv)
+    unknown = [o for o in args.outlets if o not in OUTLETS]
+    if unknown:
+        parser.error(f"unbekanntes Medium: {', '.join(unknown)}")
+
+    overrides = {}
+    if args.start_year is not None:
+        overrides["start_year"] = args.start_year
+    if args.end_year is not None:
+        overrides["end_year"] = args.end_year
+
+    started = time.time()
+    results = crawl_all(args.outlets, out_dir=args.out_dir, workers=args.workers, **overrides)
+    print_summary(results, time.time() - started)
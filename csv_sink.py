@@ -0,0 +1,198 @@
+import csv
+import os
+import threading
+
+URL_FIELDS = ["year", "month", "lastmod", "category", "url"]
+COUNT_FIELDS = ["year", "Frauenfussball", "Herrenfussball", "Total", "Frauen_Anteil"]
+FLUSH_EVERY = 500
+
+
+class YearCounter:
+    """Zaehlt Frauen-/Herrenfussball pro Jahr, ohne die Zeilen zu behalten."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def add(self, year, category: str):
+        # Jahre aus einer gelesenen CSV kommen als String
+        counts = self.counts.setdefault(int(year), {"Frauenfussball": 0, "Herrenfussball": 0, "Total": 0})
+        counts[category] += 1
+        counts["Total"] += 1
+
+    def rows(self) -> list:
+        rows = []
+        for y in sorted(self.counts.keys()):
+            total = self.counts[y]["Total"]
+            women = self.counts[y]["Frauenfussball"]
+            rows.append({
+                "year": y,
+                "Frauenfussball": women,
+                "Herrenfussball": self.counts[y]["Herrenfussball"],
+                "Total": total,
+                "Frauen_Anteil": round((women / total) if total else 0.0, 4)
+            })
+        return rows
+
+
+def count_rows(urls_csv: str) -> int:
+    """Datenzeilen einer URL-CSV ohne Kopf (eine Zeile pro URL), 0 wenn es sie nicht gibt."""
+    if not os.path.exists(urls_csv):
+        return 0
+    with open(urls_csv, "rb") as f:
+        return max(0, sum(1 for _ in f) - 1)
+
+
+def write_counts(counts_csv: str, rows: list, lineterminator: str = "\r\n"):
+    with open(counts_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=COUNT_FIELDS, lineterminator=lineterminator)
+        w.writeheader()
+        w.writerows(rows)
+
+
+def merge_rows(urls_csv: str, counts_csv: str, new_rows, fieldnames=None) -> tuple:
+    """
+    Fuehrt neue Zeilen (Delta-Lauf) in eine bestehende URL-CSV zusammen:
+    eine URL, die schon drin ist, wird an ihrer Stelle ersetzt, neue URLs
+    kommen ans Ende. Schreibt danach die Counts-CSV neu. Gibt
+    (YearCounter, hinzugefuegt, ersetzt) zurueck.
+    """
+    fieldnames = fieldnames or URL_FIELDS
+    with open(urls_csv, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    position = {}
+    for i, row in enumerate(rows):
+        position.setdefault(row["url"], i)
+    added = replaced = 0
+    for row in new_rows:
+        i = position.get(row["url"])
+        if i is None:
+            position[row["url"]] = len(rows)
+            rows.append(row)
+            added += 1
+        else:
+            rows[i] = row
+            replaced += 1
+
+    counter = YearCounter()
+    tmp = urls_csv + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        w.writeheader()
+        for row in rows:
+            w.writerow(row)
+            counter.add(row["year"], row["category"])
+    os.replace(tmp, urls_csv)
+    write_counts(counts_csv, counter.rows())
+    return counter, added, replaced
+
+
+def split_by_year(urls_csv: str, targets: list, fieldnames=None) -> list:
+    """
+    Verteilt die Zeilen einer URL-CSV nach Jahr auf mehrere Dateien:
+    targets ist eine Liste von (start_year, end_year, urls_csv, counts_csv).
+    Schreibt auch die Counts-CSV jedes Ziels und gibt pro Ziel die Anzahl
+    Zeilen zurueck. Zeilen ausserhalb aller Bereiche fallen weg.
+    """
+    fieldnames = fieldnames or URL_FIELDS
+    files = []
+    writers = []
+    counters = [YearCounter() for _ in targets]
+    rows = [0] * len(targets)
+    try:
+        for _start, _end, target_csv, _counts_csv in targets:
+            f = open(target_csv, "w", newline="", encoding="utf-8")
+            files.append(f)
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writers.append(writer)
+        with open(urls_csv, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                year = int(row["year"])
+                for i, (start, end, _urls, _counts) in enumerate(targets):
+                    if start <= year <= end:
+                        writers[i].writerow(row)
+                        counters[i].add(year, row["category"])
+                        rows[i] += 1
+    finally:
+        for f in files:
+            f.close()
+    for (_start, _end, _urls, counts_csv), counter in zip(targets, counters):
+        write_counts(counts_csv, counter.rows())
+    return rows
+
+
+class CsvSink:
+    """
+    Schreibt Treffer direkt in die URL-CSV (flush alle flush_every Zeilen)
+    und zaehlt nebenbei pro Jahr. Die Counts-CSV entsteht bei close(),
+    auch wenn der Crawl mit einer Exception abbricht (with-Block).
+
+    keep_rows (z.B. aus checkpoint.CheckpointJournal) setzt eine bestehende
+    URL-CSV fort: die ersten keep_rows Zeilen bleiben und werden mitgezaehlt,
+    alles dahinter (halb geschriebene Sitemap) wird abgeschnitten.
+    """
+
+    def __init__(self, urls_csv: str, counts_csv: str, fieldnames=None, flush_every: int = FLUSH_EVERY,
+                 keep_rows: int = None):
+        self.urls_csv = urls_csv
+        self.counts_csv = counts_csv
+        self.counter = YearCounter()
+        self.rows = 0
+        self.flush_every = flush_every
+        self._pending = 0
+        self._lock = threading.Lock()
+        resume = keep_rows is not None and os.path.exists(urls_csv)
+        if resume:
+            self._truncate(keep_rows)
+        self._file = open(urls_csv, "a" if resume else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames or URL_FIELDS, extrasaction="ignore")
+        if not resume or self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def _truncate(self, keep_rows: int):
+        # eine Zeile pro URL (URLs enthalten keine Zeilenumbrueche)
+        with open(self.urls_csv, "r+b") as f:
+            header = f.readline()
+            if not header:
+                return
+            fields = next(csv.reader([header.decode("utf-8")]))
+            while self.rows < keep_rows:
+                line = f.readline()
+                if not line:
+                    break
+                row = dict(zip(fields, next(csv.reader([line.decode("utf-8")]))))
+                self.counter.add(row["year"], row["category"])
+                self.rows += 1
+            f.truncate(f.tell())
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            self._pending = 0
+
+    def write(self, row: dict):
+        with self._lock:
+            self._writer.writerow(row)
+            self.counter.add(row["year"], row["category"])
+            self.rows += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+        write_counts(self.counts_csv, self.counter.rows())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
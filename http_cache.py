@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import date, timedelta
+
+
+def default_cache_dir() -> str:
+    # ausserhalb des Repos (Sitemaps sind schnell einige GB); CRAWLER_HTTP_CACHE setzt den Ort fest
+    if os.environ.get("CRAWLER_HTTP_CACHE"):
+        return os.environ["CRAWLER_HTTP_CACHE"]
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "football-media-crawler", "http_cache")
+
+
+CACHE_DIR = default_cache_dir()
+ENABLED = True
+# Sitemaps, deren Monat laenger als FREEZE_DAYS zurueckliegt, aendern sich nicht mehr
+FREEZE_DAYS = 62
+
+MONTH_PATTERNS = [
+    re.compile(r"[?&]date=(19\d{2}|20\d{2})(\d{2})\b"),
+    re.compile(r"/(?:sitemap-)?(19\d{2}|20\d{2})[-_](\d{2})(?:[-_][^/]*)?\.xml"),
+]
+
+
+def configure(cache_dir: str = None, enabled: bool = None, freeze_days: int = None):
+    global CACHE_DIR, ENABLED, FREEZE_DAYS
+    if cache_dir is not None:
+        CACHE_DIR = cache_dir
+    if enabled is not None:
+        ENABLED = enabled
+    if freeze_days is not None:
+        FREEZE_DAYS = freeze_days
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _meta_path(url: str) -> str:
+    key = cache_key(url)
+    return os.path.join(CACHE_DIR, "urls", key[:2], key + ".json")
+
+
+def _body_path(digest: str) -> str:
+    # Inhalte liegen unter ihrem sha256, gleiche Bodies nur einmal
+    return os.path.join(CACHE_DIR, "objects", digest[:2], digest)
+
+
+def sitemap_month(url: str):
+    for pattern in MONTH_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return int(m.group(1)), int(m.group(2))
+    return None
+
+
+def is_frozen(url: str, today: date = None) -> bool:
+    ym = sitemap_month(url)
+    if ym is None:
+        return False
+    horizon = (today or date.today()) - timedelta(days=FREEZE_DAYS)
+    return ym < (horizon.year, horizon.month)
+
+
+def has_frozen(url: str) -> bool:
+    """True wenn url ohne Netzwerk aus dem Cache kommt (Rate-Limit kann entfallen)."""
+    return ENABLED and is_frozen(url) and os.path.exists(_meta_path(url))
+
+
+def lookup(url: str):
+    """Gibt (body, meta) zurueck oder None."""
+    try:
+        with open(_meta_path(url), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(_body_path(meta["sha256"]), "rb") as f:
+            body = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+    return body, meta
+
+
+def stored_etag(url: str) -> str:
+    try:
+        with open(_meta_path(url), "r", encoding="utf-8") as f:
+            return json.load(f).get("etag", "")
+    except (OSError, ValueError):
+        return ""
+
+
+def conditional_headers(meta: dict) -> dict:
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def store(url: str, body: bytes, headers) -> dict:
+    digest = hashlib.sha256(body).hexdigest()
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag", ""),
+        "last_modified": headers.get("Last-Modified", ""),
+        "sha256": digest,
+    }
+    body_path = _body_path(digest)
+    meta_path = _meta_path(url)
+    os.makedirs(os.path.dirname(body_path), exist_ok=True)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    if not os.path.exists(body_path):
+        _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return meta
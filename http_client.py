@@ -0,0 +1,146 @@
+import gzip
+import threading
+import zlib
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cache
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Maturaarbeit; contact: your-email@example.com)"
+}
+
+TIMEOUT = 30
+POOL_SIZE = 10
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def configure(pool_size: int = None, headers: dict = None):
+    """
+    Changes pool size / headers. Existing sessions are closed so the
+    next request opens a session with the new settings.
+    """
+    global POOL_SIZE
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    if headers is not None:
+        HEADERS.clear()
+        HEADERS.update(headers)
+    close()
+
+
+def host_of(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def get_session(url: str) -> requests.Session:
+    # eine keep-alive Session pro Host
+    host = host_of(url)
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+    return session
+
+
+def fetch_response(url: str) -> requests.Response:
+    r = get_session(url).get(url, timeout=TIMEOUT)
+    r.raise_for_status()
+    return r
+
+
+def fetch_cached(url: str) -> bytes:
+    cached = http_cache.lookup(url) if http_cache.ENABLED else None
+    if cached is None:
+        r = fetch_response(url)
+        if http_cache.ENABLED:
+            http_cache.store(url, r.content, r.headers)
+        return r.content
+
+    body, meta = cached
+    if http_cache.is_frozen(url):
+        return body
+    r = get_session(url).get(url, headers=http_cache.conditional_headers(meta), timeout=TIMEOUT)
+    if r.status_code == 304:
+        return body
+    r.raise_for_status()
+    http_cache.store(url, r.content, r.headers)
+    return r.content
+
+
+def decompress(data: bytes) -> bytes:
+    # .gz Sitemaps kommen ohne Content-Encoding, daher ueber die Magic Bytes erkennen
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return data
+
+
+def decompress_head(data: bytes, size: int) -> bytes:
+    # nur der Anfang, z.B. um den Typ einer Sitemap zu sehen, ohne alles zu entpacken
+    if data[:2] == b"\x1f\x8b":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data, size)
+    return data[:size]
+
+
+def decompressed_size(data: bytes) -> int:
+    # gzip: Groesse aus dem Trailer (ISIZE, mod 2**32), ohne zu entpacken
+    if data[:2] == b"\x1f\x8b" and len(data) >= 18:
+        return max(len(data), int.from_bytes(data[-4:], "little"))
+    return len(data)
+
+
+def fetch(url: str) -> bytes:
+    return decompress(fetch_cached(url))
+
+
+def fetch_exists(url: str) -> bool:
+    """
+    True wenn url geladen werden kann (der Body landet dabei im Cache),
+    False bei 404/410. Andere Fehler gehen an den Aufrufer.
+    """
+    try:
+        fetch_cached(url)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code in (404, 410):
+            return False
+        raise
+    return True
+
+
+def fetch_changed(url: str, etag: str = ""):
+    """
+    Laedt url nur, wenn sie sich seit etag (aus einem frueheren Lauf)
+    geaendert hat. Gibt (body, etag) zurueck, body ist None bei 304.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    r = get_session(url).get(url, headers=headers, timeout=TIMEOUT)
+    if r.status_code == 304:
+        return None, etag
+    r.raise_for_status()
+    if http_cache.ENABLED:
+        http_cache.store(url, r.content, r.headers)
+    return r.content, r.headers.get("ETag", "")
+
+
+def fetch_text(url: str) -> str:
+    return fetch_response(url).text
+
+
+def close():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
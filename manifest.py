@@ -0,0 +1,50 @@
+import json
+import os
+
+
+class CrawlManifest:
+    """
+    Stand jeder Kind-Sitemap aus dem letzten Lauf: lastmod aus dem Index,
+    ETag der Antwort und Anzahl Zeilen, die sie geliefert hat. Ein
+    Delta-Lauf laedt nur Sitemaps, deren lastmod sich seither bewegt hat.
+    months haelt fest, ab wann es Monats-Sitemaps gibt (discovery.probe_months).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sitemaps = {}
+        self.months = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.sitemaps = data.get("sitemaps", {})
+            self.months = data.get("months", {})
+
+    def unchanged(self, sitemap_url: str, lastmod: str) -> bool:
+        # ohne lastmod ist nichts bekannt, dann entscheidet der ETag beim Laden
+        entry = self.sitemaps.get(sitemap_url)
+        return bool(entry and lastmod and entry["lastmod"] == lastmod)
+
+    def etag(self, sitemap_url: str) -> str:
+        entry = self.sitemaps.get(sitemap_url)
+        return entry["etag"] if entry else ""
+
+    def update(self, sitemap_url: str, lastmod: str, etag: str, rows: int):
+        self.sitemaps[sitemap_url] = {"lastmod": lastmod, "etag": etag, "rows": rows}
+
+    def set_lastmod(self, sitemap_url: str, lastmod: str):
+        if sitemap_url in self.sitemaps:
+            self.sitemaps[sitemap_url]["lastmod"] = lastmod
+
+    def clear(self):
+        self.sitemaps = {}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"sitemaps": self.sitemaps, "months": self.months}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def manifest_path(urls_csv: str) -> str:
+    return urls_csv + ".manifest.json"
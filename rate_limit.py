@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+from http_client import HEADERS, fetch_text, host_of
+
+_buckets = {}
+_crawl_delays = {}
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token-Bucket pro Host. Wartet nur, wenn der naechste Request die Rate
+    ueberschreiten wuerde; Zeit fuer Parsen/Klassifizieren zaehlt als Pause.
+    rate=None oder 0 bedeutet unbegrenzt.
+    """
+
+    def __init__(self, rate: float = None, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float = None, burst: int = None):
+        with self._lock:
+            self.rate = rate
+            if burst is not None:
+                self.capacity = max(1, burst)
+                self._tokens = min(self._tokens, self.capacity)
+
+    def _reserve(self) -> float:
+        # nimmt ein Token (darf negativ werden = Reservation) und gibt die Wartezeit zurueck
+        with self._lock:
+            now = time.monotonic()
+            if not self.rate:
+                self._last = now
+                return 0.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _effective_rate(host: str, rate: float = None):
+    delay = _crawl_delays.get(host)
+    if not delay:
+        return rate
+    robots_rate = 1.0 / delay
+    return min(rate, robots_rate) if rate else robots_rate
+
+
+def limiter_for(url: str, rate: float = None, burst: int = 1) -> TokenBucket:
+    """
+    Gemeinsamer Limiter fuer den Host von url. Beim ersten Aufruf wird er
+    mit rate/burst angelegt, ein Crawl-delay aus robots.txt gewinnt immer.
+    """
+    host = host_of(url)
+    with _lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(_effective_rate(host, rate), burst)
+    return bucket
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = "*"):
+    """
+    Crawl-delay fuer user_agent: die Gruppe, deren User-agent genau dem
+    Produkt-Token entspricht ("Mozilla" bei "Mozilla/5.0 (...)", ohne
+    Gross/Klein), sonst die Gruppe "*". None wenn keine ein Crawl-delay hat.
+    """
+    agent = user_agent.split("/", 1)[0].strip().lower() or "*"
+    delays = {}
+    group = []
+    in_rules = False
+    for line in robots_txt.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        key = key.strip().lower()
+        value = value.strip()
+        if key == "user-agent":
+            if in_rules:
+                group = []
+                in_rules = False
+            group.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for name in group:
+                delays[name] = delay
+    if agent in delays:
+        return delays[agent]
+    return delays.get("*")
+
+
+def apply_crawl_delay(url: str, robots_txt: str, user_agent: str = None):
+    delay = parse_crawl_delay(robots_txt, user_agent or HEADERS.get("User-Agent", "*"))
+    host = host_of(url)
+    with _lock:
+        # auch "kein Crawl-delay" merken, sonst laedt honour_robots robots.txt erneut
+        _crawl_delays[host] = delay or 0
+        bucket = _buckets.get(host)
+    if not delay:
+        return None
+    if bucket is not None:
+        bucket.set_rate(_effective_rate(host, bucket.rate))
+    return delay
+
+
+def honour_robots(url: str, user_agent: str = None):
+    """Laedt robots.txt des Hosts einmal und uebernimmt ein Crawl-delay."""
+    host = host_of(url)
+    if host in _crawl_delays:
+        return _crawl_delays[host]
+    try:
+        robots_txt = fetch_text(f"{host}/robots.txt")
+    except Exception:
+        robots_txt = ""
+    return apply_crawl_delay(url, robots_txt, user_agent)
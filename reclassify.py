@@ -0,0 +1,186 @@
+import argparse
+import csv
+import glob
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from classify_rules import CATEGORIES, classify_many
+from csv_sink import COUNT_FIELDS, YearCounter, write_counts
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+URLS_PATTERN = os.path.join("*", "data", "*_fussball_urls_*.csv")
+HEADING = "## Auswertung: "
+BATCH_SIZE = 5000
+# die CSVs im Repo sind mit LF eingecheckt
+LINE_END = "\n"
+
+
+def find_url_csvs(root: str = ROOT, outlets=None) -> list:
+    paths = sorted(glob.glob(os.path.join(root, URLS_PATTERN)))
+    if outlets:
+        paths = [p for p in paths if outlet_of(p) in outlets]
+    return paths
+
+
+def outlet_of(urls_csv: str) -> str:
+    # <Medium>/data/<name>_fussball_urls_*.csv, der Ordnername ist der Key in OUTLET_RULES
+    return os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(urls_csv))))
+
+
+def _batches(reader, size: int):
+    batch = []
+    for row in reader:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def markdown_table(rows: list) -> list:
+    lines = [
+        "| " + " | ".join(COUNT_FIELDS) + " |",
+        "| " + " | ".join("---" for _ in COUNT_FIELDS) + " |",
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(str(row[k]) for k in COUNT_FIELDS) + " |")
+    return lines
+
+
+def readme_headings(lines: list) -> list:
+    return [line for line in lines if line.startswith(HEADING)]
+
+
+def update_readme(readme: str, counts_name: str, rows: list) -> bool:
+    """
+    Ersetzt die Tabelle unter '## Auswertung: <counts_name>'. Gibt es nur
+    einen Abschnitt mit demselben Praefix (anderer Jahresbereich im Namen),
+    wird dieser genommen und die Ueberschrift auf counts_name gesetzt.
+    False wenn kein Abschnitt passt.
+    """
+    if not os.path.exists(readme):
+        return False
+    with open(readme, "r", encoding="utf-8") as f:
+        text = f.read()
+    bom = text.startswith("\ufeff")
+    lines = text.lstrip("\ufeff").splitlines()
+    heading = HEADING + counts_name
+    if heading not in lines:
+        prefix = HEADING + counts_name.split("_counts_")[0] + "_counts_"
+        same_prefix = [line for line in readme_headings(lines) if line.startswith(prefix)]
+        if len(same_prefix) != 1:
+            return False
+        lines[lines.index(same_prefix[0])] = heading
+    start = lines.index(heading) + 1
+    end = start
+    while end < len(lines) and (not lines[end].strip() or lines[end].startswith("|")):
+        end += 1
+    tail = [""] if end < len(lines) else []
+    lines[start:end] = [""] + markdown_table(rows) + tail
+    with open(readme, "w", encoding="utf-8-sig" if bom else "utf-8", newline="\n") as f:
+        f.write("\n".join(lines) + "\n")
+    return True
+
+
+def reclassify_file(urls_csv: str, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Klassifiziert eine URL-CSV neu (ohne Netzwerk), schreibt die Spalte
+    category, die Counts-CSV und die Tabelle im README des Mediums. Liegen
+    URL- oder Counts-CSV auch direkt im Ordner des Mediums (alte Kopien
+    neben data/), werden sie mit ueberschrieben.
+    """
+    outlet = outlet_of(urls_csv)
+    counter = YearCounter()
+    changed = 0
+    total = 0
+    tmp = f"{urls_csv}.{os.getpid()}.tmp"
+
+    with open(urls_csv, "r", newline="", encoding="utf-8") as src, \
+            open(tmp, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.DictReader(src)
+        w = csv.DictWriter(dst, fieldnames=reader.fieldnames, lineterminator=LINE_END)
+        w.writeheader()
+        for batch in _batches(reader, batch_size):
+            codes = classify_many([row["url"] for row in batch], outlet)
+            for row, code in zip(batch, codes):
+                category = CATEGORIES[code]
+                if category != row["category"]:
+                    changed += 1
+                    row["category"] = category
+                counter.add(row["year"], category)
+            w.writerows(batch)
+            total += len(batch)
+    os.replace(tmp, urls_csv)
+
+    rows = counter.rows()
+    counts_csv = os.path.join(os.path.dirname(urls_csv), os.path.basename(urls_csv).replace("_urls_", "_counts_"))
+    write_counts(counts_csv, rows, LINE_END)
+    outlet_dir = os.path.dirname(os.path.dirname(os.path.abspath(urls_csv)))
+    copies = []
+    for path in (urls_csv, counts_csv):
+        copy = os.path.join(outlet_dir, os.path.basename(path))
+        if os.path.exists(copy):
+            shutil.copyfile(path, copy)
+            copies.append(copy)
+    readme = os.path.join(outlet_dir, "README.md")
+    readme_updated = update_readme(readme, os.path.basename(counts_csv), rows)
+
+    return {
+        "outlet": outlet,
+        "urls_csv": urls_csv,
+        "counts_csv": counts_csv,
+        "copies": copies,
+        "rows": total,
+        "changed": changed,
+        "readme": readme,
+        "readme_updated": readme_updated,
+    }
+
+
+def unmatched_headings(readme: str) -> list:
+    """Abschnitte '## Auswertung: <name>' im README, zu denen es keine Counts-CSV gibt."""
+    if not os.path.exists(readme):
+        return []
+    with open(readme, "r", encoding="utf-8-sig") as f:
+        headings = readme_headings(f.read().splitlines())
+    outlet_dir = os.path.dirname(readme)
+    return [h for h in headings
+            if not any(os.path.exists(os.path.join(outlet_dir, sub, h[len(HEADING):])) for sub in ("data", ""))]
+
+
+def reclassify_all(paths: list, workers: int = None) -> list:
+    # ein Prozess pro Medium, die Dateien sind voneinander unabhaengig
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(reclassify_file, paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Klassifiziert die vorhandenen *_fussball_urls_*.csv neu (ohne Crawl)."
+    )
+    parser.add_argument("outlets", nargs="*", help="Ordnernamen, z.B. LeMonde Reppubblica (Standard: alle)")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse")
+    args = parser.parse_args()
+
+    paths = find_url_csvs(outlets=set(args.outlets))
+    if not paths:
+        print("Keine URL-CSVs gefunden.")
+        return
+
+    for result in reclassify_all(paths, args.workers):
+        readme = "README aktualisiert" if result["readme_updated"] else "README ohne Tabelle"
+        print(f"{result['outlet']}: {result['rows']} URLs, {result['changed']} geaendert, {readme}")
+        print(f"Export: {result['counts_csv']}")
+        for copy in result["copies"]:
+            print(f"Export: {copy}")
+        if not result["readme_updated"]:
+            print(f"[WARN] {result['readme']}: kein Abschnitt '{HEADING}{os.path.basename(result['counts_csv'])}'")
+        for heading in unmatched_headings(result["readme"]):
+            print(f"[WARN] {result['readme']}: keine CSV zu '{heading}'")
+    print("Fertig.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import xml.etree.ElementTree as ET
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _events(xml_bytes: bytes):
+    parser = ET.XMLPullParser(events=("start", "end"))
+    for offset in range(0, len(xml_bytes), CHUNK_SIZE):
+        parser.feed(xml_bytes[offset:offset + CHUNK_SIZE])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _iter_items(events, root, item_name: str):
+    stack = [root]
+    for event, elem in events:
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem is root or _local_name(elem.tag) != item_name:
+            continue
+        loc = lastmod = None
+        for child in elem:
+            name = _local_name(child.tag)
+            if name == "loc" and loc is None:
+                loc = child.text
+            elif name == "lastmod" and lastmod is None:
+                lastmod = child.text
+        # Element sofort freigeben, damit nie der ganze Baum im Speicher liegt
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+        if not loc:
+            continue
+        yield loc.strip(), lastmod.strip() if lastmod else ""
+
+
+def parse_sitemap(xml_bytes: bytes):
+    """
+    Returns (typ, entries) with typ "index", "urlset" or "unknown".
+    entries is an iterator of (loc, lastmod) that parses while iterating.
+    """
+    events = _events(xml_bytes)
+    for _event, root in events:
+        break
+    else:
+        return "unknown", iter(())
+    tag = root.tag.lower()
+    if tag.endswith("sitemapindex"):
+        return "index", _iter_items(events, root, "sitemap")
+    if tag.endswith("urlset"):
+        return "urlset", _iter_items(events, root, "url")
+    return "unknown", iter(())